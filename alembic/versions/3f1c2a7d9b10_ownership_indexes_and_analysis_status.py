@@ -0,0 +1,65 @@
+"""Ownership indexes and analysis status
+
+Tables so far were created by init_db (Base.metadata.create_all), which never
+alters existing tables. This brings such a database up to the current models
+and is safe to run on one create_all already built from them:
+
+- resume_analysis.status (pending/completed/failed), with feedback_json
+  nullable while an analysis is pending
+- composite (owner, created_at) indexes behind the ownership filters and
+  newest-first listings; built CONCURRENTLY so writes are not blocked
+
+Revision ID: 3f1c2a7d9b10
+Revises:
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2a7d9b10"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns)
+INDEXES = [
+    ("ix_resumes_user_id_created_at", "resumes", ["user_id", "created_at"]),
+    ("ix_job_descriptions_user_id_created_at", "job_descriptions", ["user_id", "created_at"]),
+    ("ix_job_prep_kits_user_id_created_at", "job_prep_kits", ["user_id", "created_at"]),
+    ("ix_resume_analysis_resume_id_created_at", "resume_analysis", ["resume_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    # Plain IF NOT EXISTS DDL rather than inspection, so --sql (offline) output is complete
+    op.execute(
+        "DO $$ BEGIN "
+        "CREATE TYPE analysisstatus AS ENUM ('pending', 'completed', 'failed'); "
+        "EXCEPTION WHEN duplicate_object THEN NULL; END $$"
+    )
+    # Rows from before background analyses all hold a finished result
+    op.execute(
+        "ALTER TABLE resume_analysis "
+        "ADD COLUMN IF NOT EXISTS status analysisstatus NOT NULL DEFAULT 'completed'"
+    )
+    op.alter_column("resume_analysis", "feedback_json", existing_type=postgresql.JSONB(), nullable=True)
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    op.execute("UPDATE resume_analysis SET feedback_json = '{}'::jsonb WHERE feedback_json IS NULL")
+    op.alter_column("resume_analysis", "feedback_json", existing_type=postgresql.JSONB(), nullable=False)
+    op.drop_column("resume_analysis", "status")
+    op.execute("DROP TYPE IF EXISTS analysisstatus")
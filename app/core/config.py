@@ -7,6 +7,24 @@ class Settings(BaseSettings):
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     jwt_expiration_hours: int = 24
+    auth_cache_ttl_seconds: float = 60  # How long a resolved token -> user stays cached; bounds staleness
+    auth_cache_max_entries: int = 10000  # Cached tokens per process; 0 disables the cache
+    bcrypt_rounds: int = 12  # Cost of new password hashes; older hashes are upgraded on login
+    password_hash_max_workers: int = 2  # Processes doing bcrypt work (each uses one CPU core)
+    password_hash_queue_size: int = 32  # Waiting hash/verify jobs before requests get 429
+    password_hash_timeout_seconds: float = 5  # Including time spent queued
+    # Logins queue (FIFO) for one of password_hash_max_workers slots, at most this long before a 429.
+    # A burst gets about wait * workers / bcrypt seconds logins through, the rest 429: ~80 with 2
+    # cores at ~0.25 s per verify; 40 at once on a 1-core box (~0.35 s, 2.9/s) saw 10 (25%) rejected
+    auth_login_wait_seconds: float = 10
+    
+    # Database connection pool
+    db_pool_size: int = 10  # Connections kept open per process
+    db_max_overflow: int = 10  # Extra connections opened under load, closed when returned
+    db_pool_timeout_seconds: float = 10  # Wait for a free connection before failing the request
+    db_pool_recycle_seconds: int = 1800  # Replace connections older than this (idle timeouts on proxies/LBs)
+    db_pool_pre_ping: bool = True  # Check connections on checkout so a DB restart does not fail requests
+    db_statement_timeout_ms: int = 30000  # Postgres statement_timeout per connection; 0 disables
     
     # Testing configuration
     testing_mode: bool = True  # Set to False in production
@@ -14,6 +32,50 @@ class Settings(BaseSettings):
     default_test_user_password: str = "manav123"
     default_test_user_name: str = "Manav"
     
+    # LaTeX rendering
+    latex_template_cache_size: int = 32  # Preprocessed templates kept in memory
+    latex_section_cache_size: int = 4096  # Rendered section fragments kept in memory
+    render_cache_dir: str = "static/resumes/cache"  # Content-addressed .tex/.pdf artifacts
+    render_cache_max_bytes: int = 512 * 1024 * 1024
+    
+    # PDF compilation
+    latex_compile_online: bool = True  # Try online LaTeX services before local pdflatex
+    pdf_compile_max_workers: int = 2  # Concurrent compiles (each drives one TeX process)
+    pdf_compile_queue_size: int = 16  # Waiting jobs before new requests get 429
+    pdf_compile_timeout_seconds: float = 60  # Per job, shared by the online attempts and the local fallback
+    pdf_job_ttl_seconds: int = 3600  # How long finished PDF jobs stay pollable
+    latex_precompile_preamble: bool = True  # Dump template preambles into pdflatex format files
+    latex_format_dir: str = ".cache/latex_formats"
+    
+    # Analysis
+    analysis_batch_max_jobs: int = 50  # Job descriptions accepted by POST /analysis/batch
+    analysis_stale_after_seconds: float = 600  # Pending analyses older than this are marked failed (their worker died); well above the longest an LLM call can take with retries
+    
+    # AI provider
+    ai_call_timeout_seconds: float = 60  # Per LLM call, including time spent waiting for a slot
+    ai_max_concurrent_calls: int = 8  # In-flight LLM calls per process
+    ai_rate_limit_per_second: float = 5  # Global LLM call rate (token bucket refill)
+    ai_rate_limit_burst: int = 20
+    ai_user_rate_limit_per_second: float = 0.5  # Per-user LLM call rate
+    ai_user_rate_limit_burst: int = 30  # Enough for one prep kit or a resume's bullet enhancements
+    ai_rate_limit_max_wait_seconds: float = 5  # Wait this long for a token before answering 429
+    ai_retry_attempts: int = 3  # Tries per LLM call on 429/5xx/timeouts
+    ai_retry_base_delay_seconds: float = 0.5  # Full-jitter exponential backoff
+    ai_retry_max_delay_seconds: float = 8
+    ai_circuit_failure_threshold: int = 5  # Consecutive provider failures before failing fast
+    ai_circuit_reset_seconds: float = 30  # How long to fail fast before probing the provider again
+    ai_cost_per_1k_input_tokens: float = 0.000125  # USD, for usage accounting only
+    ai_cost_per_1k_output_tokens: float = 0.000375
+    ai_tracked_users: int = 10000  # Users kept in the rate limiter and usage counters
+    ai_enhance_concurrency: int = 5  # Parallel enhancement prompts per resume
+    ai_enhance_batch_size: int = 20  # Bullets per enhancement prompt; up to this many take one LLM round-trip
+    ai_prep_kit_section_attempts: int = 3  # Tries per prep-kit section before it is reported as failed
+    ai_prompt_token_budget: int = 1500  # Max estimated tokens of resume text per prompt
+    ai_cache_enabled: bool = True  # Reuse analysis/prep-kit responses for identical inputs
+    ai_cache_path: str = ".cache/ai_responses.sqlite3"
+    ai_cache_ttl_seconds: int = 7 * 24 * 3600
+    ai_cache_max_entries: int = 5000
+    
     # Add other settings as needed
 
     class Config:
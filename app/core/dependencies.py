@@ -5,27 +5,38 @@ from app.db.session import get_db
 from app.modules.auth.models import User
 from app.core.security import decode_access_token
 from app.core.config import settings
+from app.core.principal_cache import UserPrincipal, principal_cache
 from typing import Optional
+import time
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token", auto_error=False)
 
 def get_current_user(
     token: Optional[str] = Depends(oauth2_scheme), 
     db: Session = Depends(get_db)
-) -> User:
+) -> UserPrincipal:
     """
-    Get the current authenticated user.
+    Get the current authenticated user, as a read-only UserPrincipal snapshot.
     In testing mode, automatically returns the default test user.
+    Resolved tokens are cached briefly (see PrincipalCache), so repeat requests
+    skip the JWT check and the users query.
     """
     # Testing mode: Always return default test user
     if settings.testing_mode:
+        cache_key = principal_cache.make_key(f"testing-mode:{settings.default_test_user_email}")
+        principal = principal_cache.get(cache_key)
+        if principal is not None:
+            return principal
+        started_at = time.perf_counter()
         user = db.query(User).filter(User.email == settings.default_test_user_email).first()
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Default test user '{settings.default_test_user_name}' not found. Please restart the application."
             )
-        return user
+        principal = UserPrincipal(user)
+        principal_cache.put(cache_key, principal, resolve_seconds=time.perf_counter() - started_at)
+        return principal
     
     # Production mode: Validate token
     if not token:
@@ -35,6 +46,12 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    cache_key = principal_cache.make_key(token)
+    principal = principal_cache.get(cache_key)
+    if principal is not None:
+        return principal
+    
+    started_at = time.perf_counter()
     payload = decode_access_token(token)
     if payload is None:
         raise HTTPException(
@@ -58,4 +75,6 @@ def get_current_user(
             detail="User not found"
         )
     
-    return user
\ No newline at end of file
+    principal = UserPrincipal(user)
+    principal_cache.put(cache_key, principal, token_expires_at=payload.get("exp"), resolve_seconds=time.perf_counter() - started_at)
+    return principal
\ No newline at end of file
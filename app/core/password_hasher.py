@@ -0,0 +1,107 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full or a job does not finish within the timeout."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hash/verify in a small process pool, so the 100-300 ms of CPU
+    each one costs neither blocks the event loop nor competes for the API
+    process's GIL.
+
+    At most max_workers jobs run at once and at most max_queue wait behind
+    them; further jobs raise PasswordHasherBusy right away, as does a job that
+    is not done within timeout_seconds. Worker processes are spawned (not
+    forked from the threaded server) on first use.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, timeout_seconds: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._seconds_total = 0.0
+        self._seconds_max = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHasherBusy(f"Password hashing queue is full ({self.max_queue} jobs waiting)")
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            executor = self._executor
+            self._pending += 1
+            future = executor.submit(fn, *args)
+        started_at = time.perf_counter()
+        future.add_done_callback(lambda f: self._finish(started_at, f))
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            # Drops the job if it is still queued; a running one finishes and is discarded
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            raise PasswordHasherBusy(f"Password hashing did not finish within {self.timeout_seconds} seconds")
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool on the next call
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise PasswordHasherBusy("Password hashing workers restarted, retry shortly")
+
+    def _finish(self, started_at: float, future: Future) -> None:
+        elapsed = time.perf_counter() - started_at
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled():
+                self._completed += 1
+                self._seconds_total += elapsed
+                self._seconds_max = max(self._seconds_max, elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                # Queue wait plus hashing time
+                "avg_seconds": round(self._seconds_total / self._completed, 4) if self._completed else 0.0,
+                "max_seconds": round(self._seconds_max, 4),
+            }
+
+
+password_hasher = PasswordHasher(
+    settings.password_hash_max_workers,
+    settings.password_hash_queue_size,
+    settings.password_hash_timeout_seconds,
+)
@@ -4,7 +4,7 @@ from passlib.context import CryptContext
 from app.core.config import settings
 import hashlib
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 
 def _prepare_password(password: str) -> str:
     """
@@ -26,6 +26,10 @@ def get_password_hash(password):
     prepared_password = _prepare_password(password)
     return pwd_context.hash(prepared_password)
 
+def password_needs_rehash(hashed_password):
+    """True when the hash was made with a different cost than settings.bcrypt_rounds."""
+    return pwd_context.needs_update(hashed_password)
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     if expires_delta:
@@ -1,16 +1,182 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Optional, Union
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
 
-engine = create_engine(settings.database_url)
+# Nesting depth of QueuePool._do_get in the current thread / greenlet
+_checkout_depth: ContextVar[int] = ContextVar("pool_checkout_depth", default=0)
+
+# Async drivers used in place of the sync ones in DATABASE_URL
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long checkouts wait for a connection, how
+    many overflow connections get opened, and how many checkouts time out.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_opened = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self) -> Any:
+        # QueuePool._do_get retries by calling itself; only time the outermost call
+        if _checkout_depth.get():
+            return super()._do_get()
+        depth = _checkout_depth.set(1)
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            with self._metrics_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            _checkout_depth.reset(depth)
+        waited = time.perf_counter() - started_at
+        with self._metrics_lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        return connection
+
+    def _inc_overflow(self) -> bool:
+        opened = super()._inc_overflow()
+        # Below zero the pool is still filling up to pool_size; above it, it is overflowing
+        if opened and self._overflow > 0:
+            with self._metrics_lock:
+                self.overflow_opened += 1
+        return opened
+
+    def stats(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": self.overflow(),
+                "max_overflow": self._max_overflow,
+                "checkouts": self.checkouts,
+                "overflow_opened": self.overflow_opened,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool for async engines."""
+
+
+def _pool_options(poolclass: type) -> Dict[str, Any]:
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def create_pooled_engine(database_url: str, **overrides: Any) -> Engine:
+    """
+    Engine with the pool settings from app.core.config (db_pool_*, db_statement_timeout_ms).
+    Keyword overrides win over settings, e.g. for load tests.
+    """
+    options = _pool_options(InstrumentedQueuePool)
+    statement_timeout_ms = overrides.pop("statement_timeout_ms", settings.db_statement_timeout_ms)
+    if statement_timeout_ms and make_url(database_url).get_backend_name() == "postgresql":
+        # Server-side cap on every statement run through this engine
+        options["connect_args"] = {"options": f"-c statement_timeout={int(statement_timeout_ms)}"}
+    options.update(overrides)
+    return create_engine(database_url, **options)
+
+
+def async_database_url(database_url: str) -> str:
+    """DATABASE_URL with its driver swapped for the async one (postgresql -> asyncpg, sqlite -> aiosqlite)."""
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        return database_url
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+def create_async_pooled_engine(database_url: str, **overrides: Any) -> AsyncEngine:
+    """Async counterpart of create_pooled_engine; database_url may name either driver."""
+    database_url = async_database_url(database_url)
+    options = _pool_options(InstrumentedAsyncQueuePool)
+    statement_timeout_ms = overrides.pop("statement_timeout_ms", settings.db_statement_timeout_ms)
+    if statement_timeout_ms and make_url(database_url).get_backend_name() == "postgresql":
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(int(statement_timeout_ms))}}
+    options.update(overrides)
+    return create_async_engine(database_url, **options)
+
+
+def pool_stats(bind: Optional[Union[Engine, AsyncEngine]] = None) -> Dict[str, Any]:
+    pool = (bind or engine).pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"status": pool.status()}
+
+
+engine = create_pooled_engine(settings.database_url)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# For async route handlers and background tasks, so DB waits do not block the event loop.
+# Objects stay loaded after commit: lazy loads would need an await the caller cannot do implicitly.
+async_engine = create_async_pooled_engine(settings.database_url)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
+
+class LazySession:
+    """
+    Stands in for a Session and only creates the real one on first use, so
+    requests whose handlers never touch the database skip session setup and
+    teardown entirely. (A Session already waits for its first query before
+    checking out a pool connection.)
+    """
+
+    __slots__ = ("_session",)
+
+    def __init__(self):
+        self._session: Optional[Session] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = SessionLocal()
+        return getattr(self._session, name)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
 def get_db():
-    db = SessionLocal()
+    db = LazySession()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
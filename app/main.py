@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.openapi.utils import get_openapi
 from fastapi.staticfiles import StaticFiles
 from app.modules.auth.routes import router as auth_router
@@ -6,9 +7,18 @@ from app.modules.resumes.routes import router as resumes_router
 from app.modules.analysis.routes import router as analysis_router
 from app.modules.job_prep.routes import router as job_prep_router
 from app.db.init_db import init_db, seed_db
+from app.db.session import async_engine, pool_stats
 from app.middlewares.logging import LoggingMiddleware
 from app.core.logging import logger
 from app.core.config import settings
+from app.core.password_hasher import password_hasher
+from app.core.principal_cache import principal_cache
+from app.services.render_cache import render_cache
+from app.services.compile_scheduler import compile_scheduler
+from app.services.jake_template_1_latex_service import section_cache
+from app.services.ai_gateway import AIRateLimitError, AIServiceError, AITimeoutError, AIUnavailableError, ai_gateway
+from app.services.ai_cache import ai_response_cache
+from app.tasks.analysis_jobs import analysis_jobs
 
 init_db()
 seed_db()
@@ -39,6 +49,23 @@ app = FastAPI(
 
 app.add_middleware(LoggingMiddleware)
 
+@app.exception_handler(AIServiceError)
+async def ai_service_error_handler(request: Request, exc: AIServiceError):
+    """Report AI provider failures as gateway errors instead of generic 500s"""
+    headers = None
+    if isinstance(exc, AIRateLimitError):
+        status_code = 429
+    elif isinstance(exc, AIUnavailableError):
+        status_code = 503
+    elif isinstance(exc, AITimeoutError):
+        status_code = 504
+    else:
+        status_code = 502
+    if isinstance(exc, (AIRateLimitError, AIUnavailableError)):
+        headers = {"Retry-After": str(max(1, round(exc.retry_after)))}
+    logger.warning(f"AI call failed: {exc}")
+    return JSONResponse(status_code=status_code, content={"detail": str(exc)}, headers=headers)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -57,10 +84,31 @@ def read_root():
         "message": "Authentication bypassed in testing mode" if settings.testing_mode else "Authentication required"
     }
 
+@app.on_event("startup")
+async def start_background_tasks():
+    # Fail analyses left pending by a previous process, now and periodically
+    analysis_jobs.start_sweeper()
+
 @app.get("/health")
 def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
         "testing_mode": settings.testing_mode
-    }
\ No newline at end of file
+    }
+
+@app.get("/metrics")
+def metrics():
+    """Connection pool, cache and worker counters"""
+    return {
+        "db_pool": pool_stats(),
+        "db_async_pool": pool_stats(async_engine),
+        "auth_principal_cache": principal_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "render_cache": render_cache.stats(),
+        "latex_section_cache": section_cache.stats(),
+        "pdf_compile": compile_scheduler.stats(),
+        "ai_response_cache": ai_response_cache.stats(),
+        "ai_gateway": ai_gateway.stats(),
+        "analysis_jobs": analysis_jobs.stats()
+    }
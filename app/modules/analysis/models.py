@@ -1,7 +1,7 @@
 # The line `from sqlalchemy import Column, DateTime, func, String, ForeignKey, Enum` is importing
 # specific elements from the SQLAlchemy library that are commonly used when defining database models
 # using SQLAlchemy's Object-Relational Mapping (ORM) framework.
-from sqlalchemy import Column, DateTime, func, String, ForeignKey, Enum
+from sqlalchemy import Column, DateTime, func, String, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 import enum
@@ -11,13 +11,23 @@ class AnalysisType(str, enum.Enum):
     general = "general"
     job_specific = "job_specific"
 
+class AnalysisStatus(str, enum.Enum):
+    pending = "pending"
+    completed = "completed"
+    failed = "failed"
+
 class ResumeAnalysis(Base):
     __tablename__ = "resume_analysis"
+    __table_args__ = (
+        # A resume's analyses, newest first
+        Index("ix_resume_analysis_resume_id_created_at", "resume_id", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     resume_id = Column(UUID(as_uuid=True), ForeignKey("resumes.id"), nullable=False)
     job_id = Column(UUID(as_uuid=True), ForeignKey("job_descriptions.id"), nullable=True)
     analysis_type = Column(Enum(AnalysisType), nullable=False)
-    feedback_json = Column(JSONB, nullable=False)
+    status = Column(Enum(AnalysisStatus), nullable=False, default=AnalysisStatus.completed, server_default=AnalysisStatus.completed.value)
+    feedback_json = Column(JSONB, nullable=True)  # Filled in by the analysis worker; None while pending
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
\ No newline at end of file
@@ -1,40 +1,144 @@
 import uuid
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.modules.resumes.models import Resume
 from app.modules.job_prep.models import JobDescription
-from app.modules.analysis.models import ResumeAnalysis
-from app.modules.analysis.schemas import ResumeAnalysisCreate, ResumeAnalysisResponse
+from app.modules.analysis.models import AnalysisStatus, AnalysisType, ResumeAnalysis
+from app.modules.analysis.schemas import (
+    JobMatchRequest,
+    JobMatchResponse,
+    JobMatchResult,
+    ResumeAnalysisBatchCreate,
+    ResumeAnalysisBatchItem,
+    ResumeAnalysisBatchResponse,
+    ResumeAnalysisCreate,
+    ResumeAnalysisResponse,
+)
+from app.modules.analysis.services.analysis_service import AnalysisService
+from app.core.config import settings
 from app.core.dependencies import get_current_user
-from app.services.ai_service import AIService
+from app.tasks.analysis_jobs import analysis_jobs
 
 router = APIRouter()
 
-@router.post("/", response_model=ResumeAnalysisResponse)
-async def create_analysis(analysis: ResumeAnalysisCreate, resume_id: uuid.UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
+@router.post("/", response_model=ResumeAnalysisResponse, status_code=202)
+async def create_analysis(analysis: ResumeAnalysisCreate, resume_id: uuid.UUID, refresh: bool = False, db: AsyncSession = Depends(get_async_db), current_user = Depends(get_current_user)):
+    """
+    Queue a resume analysis and return its pending row right away.
+    Poll GET /analysis/{analysis_id} until status is completed or failed. A request matching an
+    analysis that is still running returns that analysis instead of starting another one.
+    Identical requests are served from the AI response cache unless refresh=true.
+    """
+    resume = await db.scalar(select(Resume).where(Resume.id == resume_id, Resume.user_id == current_user.id))
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
     job_desc = None
     if analysis.job_id:
-        job = db.query(JobDescription).filter(JobDescription.id == analysis.job_id, JobDescription.user_id == current_user.id).first()
+        job = await db.scalar(select(JobDescription).where(JobDescription.id == analysis.job_id, JobDescription.user_id == current_user.id))
         if not job:
             raise HTTPException(status_code=404, detail="Job description not found")
         job_desc = job.description
     
-    feedback = await AIService.analyze_resume(resume.content_json, job_desc)
+    return await _queue_analysis(db, resume, analysis.job_id, job_desc, analysis.analysis_type, refresh, current_user.id)
+
+@router.post("/match", response_model=JobMatchResponse)
+def match_jobs(match: JobMatchRequest, resume_id: uuid.UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """
+    Score a resume against job descriptions locally, without any LLM call.
+    Term weights (IDF) come from all of the user's job descriptions; job_ids narrows which are scored.
+    """
+    resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    corpus = db.query(JobDescription).filter(JobDescription.user_id == current_user.id).all()
+    jobs = corpus
+    if match.job_ids is not None:
+        wanted = set(match.job_ids)
+        jobs = [job for job in corpus if job.id in wanted]
+        missing = wanted - {job.id for job in jobs}
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Job descriptions not found: {', '.join(sorted(str(job_id) for job_id in missing))}")
+    
+    ranked = AnalysisService.rank_jobs(resume.content_json, jobs, corpus=corpus)
+    results = [
+        JobMatchResult(
+            rank=rank,
+            job_id=result["job"].id,
+            title=result["job"].title,
+            score=result["score"],
+            matched_keywords=result["matched_keywords"]
+        )
+        for rank, result in enumerate(ranked[:match.limit], start=1)
+    ]
+    return JobMatchResponse(resume_id=resume_id, results=results)
+
+@router.post("/batch", response_model=ResumeAnalysisBatchResponse, status_code=202)
+async def create_batch_analysis(batch: ResumeAnalysisBatchCreate, resume_id: uuid.UUID, refresh: bool = False, db: AsyncSession = Depends(get_async_db), current_user = Depends(get_current_user)):
+    """
+    Rank many job descriptions against one resume.
+    Every job gets a local match score (see POST /analysis/match); only the top_k get a full LLM analysis, queued
+    concurrently as background jobs (poll GET /analysis/{analysis_id} for each).
+    """
+    job_ids = list(dict.fromkeys(batch.job_ids))
+    if len(job_ids) > settings.analysis_batch_max_jobs:
+        raise HTTPException(status_code=400, detail=f"At most {settings.analysis_batch_max_jobs} job descriptions per batch")
+    
+    resume = await db.scalar(select(Resume).where(Resume.id == resume_id, Resume.user_id == current_user.id))
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    jobs = (await db.scalars(select(JobDescription).where(JobDescription.id.in_(job_ids), JobDescription.user_id == current_user.id))).all()
+    missing = set(job_ids) - {job.id for job in jobs}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Job descriptions not found: {', '.join(sorted(str(job_id) for job_id in missing))}")
+    
+    ranked = AnalysisService.rank_jobs(resume.content_json, jobs)
+    
+    results = []
+    for rank, match in enumerate(ranked, start=1):
+        job = match["job"]
+        item = ResumeAnalysisBatchItem(
+            rank=rank,
+            job_id=job.id,
+            title=job.title,
+            score=match["score"],
+            matched_keywords=match["matched_keywords"]
+        )
+        if rank <= batch.top_k:
+            queued = await _queue_analysis(db, resume, job.id, job.description, AnalysisType.job_specific.value, refresh, current_user.id)
+            item.analysis_id = queued.id
+            item.status = queued.status
+        results.append(item)
+    
+    return ResumeAnalysisBatchResponse(resume_id=resume_id, results=results)
+
+async def _queue_analysis(db: AsyncSession, resume: Resume, job_id: Optional[uuid.UUID], job_desc: Optional[str], analysis_type: str, refresh: bool, user_id: uuid.UUID) -> ResumeAnalysis:
+    """Insert a pending analysis and hand it to the worker, or return the one already running for the same inputs."""
+    key = (resume.id, job_id, analysis_type)
+    pending_id = analysis_jobs.in_flight(key)
+    if pending_id:
+        pending = await db.get(ResumeAnalysis, pending_id)
+        if pending:
+            return pending
     
     db_analysis = ResumeAnalysis(
-        resume_id=resume_id,
-        job_id=analysis.job_id,
-        analysis_type=analysis.analysis_type,
-        feedback_json=feedback
+        resume_id=resume.id,
+        job_id=job_id,
+        analysis_type=analysis_type,
+        status=AnalysisStatus.pending,
+        feedback_json=None
     )
     db.add(db_analysis)
-    db.commit()
-    db.refresh(db_analysis)
+    await db.commit()
+    await db.refresh(db_analysis)
+    
+    analysis_jobs.submit(key, db_analysis.id, resume.content_json, job_desc, use_cache=not refresh, user_id=user_id)
     return db_analysis
 
 @router.get("/", response_model=list[ResumeAnalysisResponse])
@@ -42,4 +146,16 @@ def get_analyses(resume_id: uuid.UUID, db: Session = Depends(get_db), current_us
     resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
-    return db.query(ResumeAnalysis).filter(ResumeAnalysis.resume_id == resume_id).all()
\ No newline at end of file
+    return db.query(ResumeAnalysis).filter(ResumeAnalysis.resume_id == resume_id).order_by(ResumeAnalysis.created_at.desc()).all()
+
+@router.get("/{analysis_id}", response_model=ResumeAnalysisResponse)
+def get_analysis(analysis_id: uuid.UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    analysis = (
+        db.query(ResumeAnalysis)
+        .join(Resume, Resume.id == ResumeAnalysis.resume_id)
+        .filter(ResumeAnalysis.id == analysis_id, Resume.user_id == current_user.id)
+        .first()
+    )
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return analysis
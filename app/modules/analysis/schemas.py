@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 import uuid
 
@@ -15,10 +15,39 @@ class ResumeAnalysisUpdate(BaseModel):
 
 class ResumeAnalysisResponse(ResumeAnalysisBase):
     id: uuid.UUID
+    status: str
+    feedback_json: Optional[Dict[str, Any]] = None
     resume_id: uuid.UUID
     job_id: Optional[uuid.UUID]
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ResumeAnalysisBatchCreate(BaseModel):
+    job_ids: List[uuid.UUID] = Field(..., min_length=1)
+    top_k: int = Field(5, ge=0)  # How many of the best pre-ranked jobs get a full LLM analysis
+
+class JobMatchRequest(BaseModel):
+    job_ids: Optional[List[uuid.UUID]] = None  # Default: all of the user's job descriptions
+    limit: int = Field(20, ge=1, le=200)
+
+class JobMatchResult(BaseModel):
+    rank: int
+    job_id: uuid.UUID
+    title: str
+    score: float  # Local TF-IDF cosine match, 0-1
+    matched_keywords: List[str]
+
+class JobMatchResponse(BaseModel):
+    resume_id: uuid.UUID
+    results: List[JobMatchResult]
+
+class ResumeAnalysisBatchItem(JobMatchResult):
+    analysis_id: Optional[uuid.UUID] = None  # Set for the top_k jobs; poll GET /analysis/{analysis_id}
+    status: Optional[str] = None
+
+class ResumeAnalysisBatchResponse(BaseModel):
+    resume_id: uuid.UUID
+    results: List[ResumeAnalysisBatchItem]
@@ -0,0 +1,209 @@
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from app.services.prompt_context import build_resume_context
+
+# Multi-word skills and spellings the tokenizer would otherwise split, rewritten before tokenizing.
+# Each pattern only runs when its literal trigger occurs in the text.
+_SKILL_PHRASES = [
+    (trigger, re.compile(pattern), replacement)
+    for trigger, pattern, replacement in [
+        ("cd", r"\bci\s*/\s*cd\b", "cicd"),
+        ("learning", r"\bmachine learning\b", "machine-learning"),
+        ("learning", r"\bdeep learning\b", "deep-learning"),
+        ("language", r"\bnatural language processing\b", "nlp"),
+        ("vision", r"\bcomputer vision\b", "computer-vision"),
+        ("structures", r"\bdata structures\b", "data-structures"),
+        ("cloud", r"\bgoogle cloud( platform)?\b", "gcp"),
+        ("services", r"\bamazon web services\b", "aws"),
+        ("azure", r"\bmicrosoft azure\b", "azure"),
+        ("boot", r"\bspring boot\b", "spring-boot"),
+        ("c++", r"\bc\s*/\s*c\+\+", "c c++"),
+        ("css", r"\bhtml\s*/\s*css\b", "html css"),
+        ("test", r"\bunit test(ing|s)?\b", "unit-testing"),
+        ("api", r"\brest(ful)? apis?\b", "rest-api"),
+    ]
+]
+
+# Alternative spellings of the same skill -> one canonical term
+SKILL_SYNONYMS = {
+    "js": "javascript", "ecmascript": "javascript", "es6": "javascript",
+    "ts": "typescript",
+    "node": "nodejs", "node.js": "nodejs",
+    "react.js": "react", "reactjs": "react",
+    "vue.js": "vue", "vuejs": "vue",
+    "next.js": "nextjs",
+    "angular.js": "angular", "angularjs": "angular",
+    "postgres": "postgresql", "psql": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "golang": "go",
+    "py": "python", "python3": "python",
+    "cpp": "c++",
+    "csharp": "c#",
+    "ml": "machine-learning",
+    "dl": "deep-learning",
+    "tf": "tensorflow",
+    "sklearn": "scikit-learn",
+    "amazon-web-services": "aws",
+    "gcloud": "gcp",
+    "restful": "rest-api",
+    "apis": "api",
+    "dbs": "database", "databases": "database", "db": "database",
+    "microservice": "microservices",
+}
+
+# Keeps tech tokens like c++, c#, node.js and scikit-learn together
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+_STOPWORDS = frozenset(
+    "a about above after all also an and any are as at be been being both but by can could did do does doing "
+    "during each etc for from had has have having he her here his how i if in into is it its itself just me "
+    "more most must my no nor not of off on once only or other our ours out over own same she should so some "
+    "such than that the their them then there these they this those through to too under until up very was we "
+    "were what when where which while who whom why will with would you your yours "
+    "ability able experience work working team strong skills years year role responsibilities requirements "
+    "preferred required plus including using use across within new well good great join looking candidate".split()
+)
+
+# Single characters that are skills rather than noise
+_SINGLE_CHAR_TERMS = frozenset({"c", "r"})
+
+
+@lru_cache(maxsize=100_000)
+def _normalize_term(token: str) -> Optional[str]:
+    """Canonical form of a raw token, or None for stopwords, numbers and stray characters."""
+    token = token.strip(".-")
+    token = SKILL_SYNONYMS.get(token, token)
+    if token in _STOPWORDS or token.isdigit():
+        return None
+    if len(token) > 1 or token in _SINGLE_CHAR_TERMS:
+        return token
+    return None
+
+
+class JobMatchIndex:
+    """
+    TF-IDF vectors of a set of job descriptions, stored as one sparse CSR-style
+    matrix (indptr/indices/data arrays) so a resume is scored against every job
+    with a handful of vectorized NumPy operations.
+    """
+
+    def __init__(self, jobs: Sequence[Any], corpus: Optional[Sequence[Any]] = None):
+        """
+        jobs are the JobDescriptions to score; corpus (default: jobs) is the set IDF is
+        computed over, e.g. all of the user's job descriptions.
+        """
+        self.jobs = list(jobs)
+        job_counts = [Counter(AnalysisService.tokenize(f"{job.title}\n{job.description}")) for job in self.jobs]
+        if corpus is None:
+            corpus_counts = job_counts
+        else:
+            corpus_counts = [Counter(AnalysisService.tokenize(f"{job.title}\n{job.description}")) for job in corpus]
+
+        document_frequency: Counter = Counter()
+        for counts in corpus_counts:
+            document_frequency.update(counts.keys())
+        for counts in job_counts:
+            # Terms of scored jobs missing from the corpus still get a (maximal) weight
+            document_frequency.update(term for term in counts if term not in document_frequency)
+
+        self.vocabulary = {term: index for index, term in enumerate(document_frequency)}
+        self.terms = list(document_frequency)
+        df = np.fromiter(document_frequency.values(), dtype=np.float64, count=len(document_frequency))
+        self.idf = np.log((1 + len(corpus_counts)) / (1 + df)) + 1
+
+        indptr = [0]
+        indices: List[int] = []
+        counts_flat: List[int] = []
+        for counts in job_counts:
+            indices.extend(self.vocabulary[term] for term in counts)
+            counts_flat.extend(counts.values())
+            indptr.append(len(indices))
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        # Sublinear term frequency
+        self.data = (1 + np.log(np.asarray(counts_flat, dtype=np.float64))) * self.idf[self.indices]
+        self.norms = self._row_sums(self.data * self.data) ** 0.5
+
+    def resume_vector(self, resume_content: Dict[str, Any]) -> np.ndarray:
+        """Dense TF-IDF vector of the flattened resume over this index's vocabulary."""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float64)
+        text = build_resume_context(resume_content).text
+        for term, count in Counter(AnalysisService.tokenize(text)).items():
+            index = self.vocabulary.get(term)
+            if index is not None:
+                vector[index] = (1 + np.log(count)) * self.idf[index]
+        return vector
+
+    def scores(self, resume_vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity (0-1) of the resume against every job, in job order."""
+        dots = self._row_sums(self.data * resume_vector[self.indices])
+        resume_norm = np.sqrt(resume_vector @ resume_vector)
+        denominators = self.norms * resume_norm
+        return np.divide(dots, denominators, out=np.zeros_like(dots), where=denominators > 0)
+
+    def matched_keywords(self, position: int, resume_vector: np.ndarray, count: int) -> List[str]:
+        """The job's highest weighted terms that also occur in the resume."""
+        start, end = self.indptr[position], self.indptr[position + 1]
+        indices = self.indices[start:end]
+        weights = self.data[start:end]
+        shared = resume_vector[indices] > 0
+        order = np.argsort(-weights[shared], kind="stable")[:count]
+        return [self.terms[index] for index in indices[shared][order]]
+
+    def _row_sums(self, values: np.ndarray) -> np.ndarray:
+        sums = np.zeros(len(self.jobs), dtype=np.float64)
+        non_empty = self.indptr[:-1] < self.indptr[1:]
+        if values.size:
+            sums[non_empty] = np.add.reduceat(values, self.indptr[:-1][non_empty])
+        return sums
+
+
+class AnalysisService:
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lowercase terms with stopwords dropped and skill spellings normalized (see SKILL_SYNONYMS)."""
+        text = text.lower()
+        for trigger, pattern, replacement in _SKILL_PHRASES:
+            if trigger in text:
+                text = pattern.sub(replacement, text)
+
+        tokens = []
+        for token in _TOKEN_RE.findall(text):
+            term = _normalize_term(token)
+            if term:
+                tokens.append(term)
+        return tokens
+
+    @staticmethod
+    def rank_jobs(
+        resume_content: Dict[str, Any],
+        jobs: Sequence[Any],
+        corpus: Optional[Sequence[Any]] = None,
+        keyword_count: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Cheap local ranking of job descriptions against one resume, best match first.
+
+        Scores are the cosine similarity of TF-IDF vectors, with IDF computed over
+        corpus (default: jobs) so terms every posting shares carry little weight.
+        Each result has the job, its score (0-1) and the job's highest weighted
+        terms that also appear in the resume.
+        """
+        if not jobs:
+            return []
+        index = JobMatchIndex(jobs, corpus)
+        resume_vector = index.resume_vector(resume_content)
+        scores = index.scores(resume_vector)
+
+        ranked = []
+        for position in np.argsort(-scores, kind="stable"):
+            ranked.append({
+                "job": index.jobs[position],
+                "score": round(float(scores[position]), 4),
+                "matched_keywords": index.matched_keywords(position, resume_vector, keyword_count),
+            })
+        return ranked
@@ -1,25 +1,43 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from app.db.session import get_db
+from sqlalchemy import or_, select
+from app.db.session import get_async_db, get_db
 from app.modules.auth.models import User, AuthProviderEnum, UserRole
 from app.modules.auth.schemas import UserCreate, UserResponse, OAuthUserCreate
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.security import create_access_token, password_needs_rehash
+from app.core.password_hasher import PasswordHasherBusy, password_hasher
+from app.core.principal_cache import principal_cache
 from typing import Optional
+import asyncio
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def authenticate_user(db: Session, identifier: str, password: str):
+# One login slot per hashing process: a burst queues here in arrival order, for up to
+# auth_login_wait_seconds, instead of filling the hasher's queue and timing out there
+_login_slots = asyncio.Semaphore(settings.password_hash_max_workers)
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many sign-in requests right now. Please retry shortly.",
+        headers={"Retry-After": "2"}
+    )
+
+async def authenticate_user(db: AsyncSession, identifier: str, password: str):
     """
     Authenticate user by email or username
     identifier can be either email or username
+    A hash made with an outdated cost is replaced after a successful check.
     """
     # Try to find user by email or username
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         or_(User.email == identifier, User.username == identifier)
-    ).first()
+    ))
     
     if not user:
         return False
@@ -28,9 +46,17 @@ def authenticate_user(db: Session, identifier: str, password: str):
     if not user.password:
         return False
         
-    if not verify_password(password, user.password):
+    if not await password_hasher.verify(password, user.password):
         return False
     
+    if password_needs_rehash(user.password):
+        try:
+            user.password = await password_hasher.hash(password)
+            await db.commit()
+        except PasswordHasherBusy:
+            # Keep the old hash; the next login tries again
+            logger.info(f"Skipped password rehash for user {user.id}: hasher busy")
+    
     return user
 
 def get_or_create_oauth_user(
@@ -61,6 +87,7 @@ def get_or_create_oauth_user(
         user.provider_id = provider_id
         db.commit()
         db.refresh(user)
+        principal_cache.invalidate(user.email)
         return user
     
     # Create new OAuth user
@@ -89,11 +116,14 @@ def get_or_create_oauth_user(
     return user
 
 @router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await db.scalar(select(User).where(User.email == user.email))
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_password = get_password_hash(user.password)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHasherBusy:
+        raise _hashing_busy()
     
     # Create user with explicit enum values
     db_user = User(
@@ -105,17 +135,26 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         auth_provider=AuthProviderEnum.email
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.post("/token")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """
     Login with email or username and password
     OAuth2 compatible endpoint for Swagger UI
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    try:
+        await asyncio.wait_for(_login_slots.acquire(), settings.auth_login_wait_seconds)
+    except asyncio.TimeoutError:
+        raise _hashing_busy()
+    try:
+        user = await authenticate_user(db, form_data.username, form_data.password)
+    except PasswordHasherBusy:
+        raise _hashing_busy()
+    finally:
+        _login_slots.release()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
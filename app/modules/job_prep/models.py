@@ -1,10 +1,14 @@
-from sqlalchemy import Column, DateTime, func, String, TEXT, ForeignKey
+from sqlalchemy import Column, DateTime, func, String, TEXT, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 from app.db.base import Base
 
 class JobDescription(Base):
     __tablename__ = "job_descriptions"
+    __table_args__ = (
+        # Ownership filters and the per-user corpus used for job matching
+        Index("ix_job_descriptions_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -17,6 +21,9 @@ class JobDescription(Base):
 
 class JobPrepKit(Base):
     __tablename__ = "job_prep_kits"
+    __table_args__ = (
+        Index("ix_job_prep_kits_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -1,39 +1,129 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_async_db, get_db
 from app.modules.resumes.models import Resume
 from app.modules.job_prep.models import JobDescription, JobPrepKit
 from app.modules.job_prep.schemas import JobPrepKitCreate, JobPrepKitResponse
 from app.core.dependencies import get_current_user
-from app.services.ai_service import AIService
+from app.services.ai_service import AIService, PREP_KIT_SECTIONS
+from typing import Any
+import asyncio
+import json
 import uuid
 
 router = APIRouter()
 
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def _save_prep_kit_section(kit_id: uuid.UUID, section: str, value: Any) -> None:
+    """Persist one generated section; uses its own short-lived session."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(JobPrepKit).where(JobPrepKit.id == kit_id).values({section: value}).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
 @router.post("/", response_model=JobPrepKitResponse)
-async def create_prep_kit(kit: JobPrepKitCreate, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    resume = db.query(Resume).filter(Resume.id == kit.resume_id, Resume.user_id == current_user.id).first()
+async def create_prep_kit(kit: JobPrepKitCreate, refresh: bool = False, db: AsyncSession = Depends(get_async_db), current_user = Depends(get_current_user)):
+    """Generate a prep kit. Identical requests are served from the AI response cache unless refresh=true."""
+    resume = await db.scalar(select(Resume).where(Resume.id == kit.resume_id, Resume.user_id == current_user.id))
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    job = db.query(JobDescription).filter(JobDescription.id == kit.job_id, JobDescription.user_id == current_user.id).first()
+    job = await db.scalar(select(JobDescription).where(JobDescription.id == kit.job_id, JobDescription.user_id == current_user.id))
     if not job:
         raise HTTPException(status_code=404, detail="Job description not found")
     
     # Assume experience is in resume or user profile, for now placeholder
     experience = "Based on resume content"  # TODO: extract from resume
     
-    kit_data = await AIService.generate_prep_kit(resume.content_json, job.description, experience)
+    # Give the connection back to the pool for the multi-second LLM call; the
+    # insert below runs in a new short transaction on a freshly checked out one
+    await db.close()
+    kit_data = await AIService.generate_prep_kit(
+        resume.content_json, job.description, experience, use_cache=not refresh, user_id=current_user.id
+    )
     
-    db_kit = JobPrepKit(**kit.dict(), user_id=current_user.id, **kit_data)
+    # Generated sections override the request's; meta keeps both
+    kit_fields = kit.dict()
+    kit_fields["meta"] = {**(kit_fields.get("meta") or {}), **kit_data.pop("meta")}
+    kit_fields.update(kit_data)
+    
+    db_kit = JobPrepKit(**kit_fields, user_id=current_user.id)
     db.add(db_kit)
-    db.commit()
-    db.refresh(db_kit)
+    await db.commit()
+    await db.refresh(db_kit)
     return db_kit
 
+@router.post("/stream")
+async def stream_prep_kit(kit: JobPrepKitCreate, refresh: bool = False, db: AsyncSession = Depends(get_async_db), current_user = Depends(get_current_user)):
+    """
+    Generate a prep kit with every section produced concurrently, streamed over Server-Sent Events.
+    Events: `kit` (the new row id), one `section` per finished section (saved to the row as it
+    arrives), `error` for a section that failed, then `done`.
+    """
+    resume = await db.scalar(select(Resume).where(Resume.id == kit.resume_id, Resume.user_id == current_user.id))
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    job = await db.scalar(select(JobDescription).where(JobDescription.id == kit.job_id, JobDescription.user_id == current_user.id))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    
+    # Create the row up front; sections are filled in as they are generated
+    db_kit = JobPrepKit(**kit.dict(), user_id=current_user.id)
+    db.add(db_kit)
+    await db.commit()
+    kit_id = db_kit.id
+    # Serialize the resume once for all section prompts
+    resume_content = AIService.resume_context(resume.content_json)
+    job_description = job.description
+    experience = "Based on resume content"  # TODO: extract from resume
+    user_id = current_user.id
+    
+    async def generate(section: str):
+        try:
+            value = await AIService.generate_prep_kit_section(
+                section, resume_content, job_description, experience, use_cache=not refresh, user_id=user_id
+            )
+            return section, value, None
+        except Exception as e:
+            return section, None, str(e)
+    
+    async def events():
+        yield _sse("kit", {"id": kit_id})
+        tasks = [asyncio.create_task(generate(section)) for section in PREP_KIT_SECTIONS]
+        failed_sections = []
+        try:
+            for finished in asyncio.as_completed(tasks):
+                section, value, error = await finished
+                if error:
+                    failed_sections.append(section)
+                    yield _sse("error", {"section": section, "detail": error})
+                    continue
+                await _save_prep_kit_section(kit_id, section, value)
+                yield _sse("section", {"section": section, "content": value})
+            meta = {**(kit.meta or {}), "failed_sections": failed_sections}
+            await _save_prep_kit_section(kit_id, "meta", meta)
+            yield _sse("done", {"id": kit_id, "failed_sections": failed_sections})
+        finally:
+            # Client went away: stop generating the remaining sections
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/", response_model=list[JobPrepKitResponse])
 def get_prep_kits(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    return db.query(JobPrepKit).filter(JobPrepKit.user_id == current_user.id).all()
+    return db.query(JobPrepKit).filter(JobPrepKit.user_id == current_user.id).order_by(JobPrepKit.created_at.desc()).all()
 
 @router.get("/{kit_id}", response_model=JobPrepKitResponse)
 def get_prep_kit(kit_id: uuid.UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
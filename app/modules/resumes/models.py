@@ -1,10 +1,14 @@
-from sqlalchemy import Column, DateTime, func, Boolean, String, Integer, ForeignKey
+from sqlalchemy import Column, DateTime, func, Boolean, String, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 from app.db.base import Base
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        # Ownership filters and the user's resume list, newest first
+        Index("ix_resumes_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
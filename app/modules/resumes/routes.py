@@ -1,43 +1,83 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.modules.resumes.models import Resume
 from app.modules.template.models import Template
 from app.modules.resumes.schemas import ResumeCreate, ResumeUpdate, ResumeResponse
+from app.modules.resumes.services.resume_service import ResumeService
 from app.core.dependencies import get_current_user
 from app.services.ai_service import AIService
-from app.services.latex_service import LaTeXService
+from app.services.jake_template_1_latex_service import LaTeXService, LATEX_RENDERER_VERSION
+from app.services.render_cache import render_cache
+from app.services.compile_scheduler import CompileQueueFull
+from app.tasks.pdf_jobs import pdf_jobs
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 router = APIRouter()
 
+async def _enhance_content(content: Dict[str, Any], user_id: uuid.UUID) -> None:
+    """Enhance every job/project description in place, in as few LLM round-trips as AIService.enhance_many allows."""
+    targets = []  # (container, key) of each text to enhance
+    items = []
+    for section in ["jobs", "projects"]:
+        for item in content.get(section) or []:
+            if "description" not in item:
+                continue
+            description = item["description"]
+            if isinstance(description, list):
+                for index, bullet in enumerate(description):
+                    targets.append((description, index))
+                    items.append((bullet, f"in {section} section"))
+            else:
+                targets.append((item, "description"))
+                items.append((description, f"in {section} section"))
+
+    enhanced = await AIService.enhance_many(items, user_id)
+    for (container, key), text in zip(targets, enhanced):
+        container[key] = text
+
+def _store_latex(cache_key: str, template, resume) -> Tuple[str, str]:
+    """Render the resume's LaTeX and store it in the render cache; returns (content, url)."""
+    # Generate LaTeX content
+    latex_content = LaTeXService.render_template(
+        template.content, resume.content_json, template_id=template.id, template_updated_at=template.updated_at
+    )
+    
+    # Save LaTeX file
+    try:
+        return latex_content, render_cache.put(cache_key, "tex", latex_content)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate LaTeX file: {str(e)}"
+        )
+
 @router.post("/", response_model=ResumeResponse)
-async def create_resume(resume: ResumeCreate, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+async def create_resume(resume: ResumeCreate, db: AsyncSession = Depends(get_async_db), current_user = Depends(get_current_user)):
     # Check if template exists
-    template = db.query(Template).filter(Template.id == resume.template_id).first()
+    template = await db.get(Template, resume.template_id)
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
 
     # Enhance with AI if requested
-    content = resume.content_json
     if resume.ai_enhanced:
+        # Give the connection back to the pool for the LLM call
+        await db.close()
         # Assume content has sections like jobs, projects
-        for section in ["jobs", "projects"]:
-            if section in content:
-                for item in content[section]:
-                    if "description" in item:
-                        item["description"] = await AIService.enhance_text(item["description"], f"in {section} section")
+        await _enhance_content(resume.content_json, current_user.id)
 
     db_resume = Resume(**resume.dict(), user_id=current_user.id)
     db.add(db_resume)
-    db.commit()
-    db.refresh(db_resume)
+    await db.commit()
+    await db.refresh(db_resume)
     return db_resume
 
 @router.get("/", response_model=list[ResumeResponse])
 def get_resumes(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    return db.query(Resume).filter(Resume.user_id == current_user.id).all()
+    return db.query(Resume).filter(Resume.user_id == current_user.id).order_by(Resume.created_at.desc()).all()
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
 def get_resume(resume_id: uuid.UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
@@ -47,24 +87,25 @@ def get_resume(resume_id: uuid.UUID, db: Session = Depends(get_db), current_user
     return resume
 
 @router.put("/{resume_id}", response_model=ResumeResponse)
-async def update_resume(resume_id: uuid.UUID, resume_update: ResumeUpdate, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
+async def update_resume(resume_id: uuid.UUID, resume_update: ResumeUpdate, db: AsyncSession = Depends(get_async_db), current_user = Depends(get_current_user)):
+    resume = await db.scalar(select(Resume).where(Resume.id == resume_id, Resume.user_id == current_user.id))
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
 
+    # Enhance before copying fields onto the row, so the enhanced text is what gets saved
+    if resume_update.ai_enhanced and resume_update.content_json:
+        # Give the connection back to the pool for the LLM call, then load the row again
+        await db.close()
+        await _enhance_content(resume_update.content_json, current_user.id)
+        resume = await db.scalar(select(Resume).where(Resume.id == resume_id, Resume.user_id == current_user.id))
+        if not resume:
+            raise HTTPException(status_code=404, detail="Resume not found")
+
     for key, value in resume_update.dict(exclude_unset=True).items():
         setattr(resume, key, value)
 
-    if resume_update.ai_enhanced and resume_update.content_json:
-        content = resume_update.content_json
-        for section in ["jobs", "projects"]:
-            if section in content:
-                for item in content[section]:
-                    if "description" in item:
-                        item["description"] = await AIService.enhance_text(item["description"], f"in {section} section")
-
-    db.commit()
-    db.refresh(resume)
+    await db.commit()
+    await db.refresh(resume)
     return resume
 
 @router.delete("/{resume_id}")
@@ -76,9 +117,12 @@ def delete_resume(resume_id: uuid.UUID, db: Session = Depends(get_db), current_u
     db.commit()
     return {"message": "Resume deleted"}
 
-@router.post("/{resume_id}/generate-pdf")
-async def generate_pdf(resume_id: uuid.UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    """Generate LaTeX file from resume. PDF compilation will be added later."""
+@router.post("/{resume_id}/generate-pdf", status_code=202)
+def generate_pdf(resume_id: uuid.UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """
+    Generate LaTeX file from resume and queue PDF compilation.
+    Poll GET /resumes/pdf-jobs/{job_id} for the compiled PDF.
+    """
     resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
@@ -87,84 +131,73 @@ async def generate_pdf(resume_id: uuid.UUID, db: Session = Depends(get_db), curr
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
     
-    # Generate LaTeX content
-    latex_content = LaTeXService.render_template(template.content, resume.content_json)
+    # Unchanged resume + template: serve the previously generated artifacts
+    cache_key = render_cache.make_key(resume.content_json, template.id, template.updated_at, LATEX_RENDERER_VERSION)
+    cached = render_cache.lookup(cache_key, "pdf", "tex")
+    if cached["pdf"]:
+        # Re-render the .tex if only it was evicted; that is cheap next to a compile
+        latex_url = cached["tex"] or _store_latex(cache_key, template, resume)[1]
+        job = pdf_jobs.completed(current_user.id, resume_id, latex_url, cached["pdf"])
+        return job.to_dict()
     
-    # Save LaTeX file
-    tex_path = f"static/resumes/{resume_id}.tex"
+    latex_content, latex_url = _store_latex(cache_key, template, resume)
+    
+    # Compile in the background; identical in-flight jobs share one compile
     try:
-        with open(tex_path, "w", encoding="utf-8") as f:
-            f.write(latex_content)
-        
-        return {
-            "status": "success",
-            "message": "LaTeX file generated successfully",
-            "latex_url": f"/static/resumes/{resume_id}.tex",
-            "note": "PDF compilation will be added once LaTeX is installed locally"
-        }
-    except Exception as e:
+        job = pdf_jobs.submit(current_user.id, resume_id, cache_key, latex_content, latex_url)
+    except CompileQueueFull:
         raise HTTPException(
-            status_code=500,
-            detail=f"Failed to generate LaTeX file: {str(e)}"
+            status_code=429,
+            detail="Too many PDFs are being generated right now. Please retry shortly.",
+            headers={"Retry-After": "5"}
         )
+    return job.to_dict()
+
+@router.get("/pdf-jobs/{job_id}")
+def get_pdf_job(job_id: uuid.UUID, current_user = Depends(get_current_user)):
+    job = pdf_jobs.get(job_id)
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="PDF job not found")
+    return job.to_dict()
 
 @router.put("/{resume_id}/sections/{section_name}")
 def update_resume_section(resume_id: uuid.UUID, section_name: str, value: Dict[str, Any], db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
-    if not resume:
+    if not ResumeService.set_section(db, resume_id, current_user.id, section_name, value):
         raise HTTPException(status_code=404, detail="Resume not found")
-
-    resume.content_json[section_name] = value
     db.commit()
-    db.refresh(resume)
     return {"message": f"Section {section_name} updated"}
 
 @router.post("/{resume_id}/sections/{section_name}/items")
 def add_resume_section_item(resume_id: uuid.UUID, section_name: str, item: Dict[str, Any], db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
-    if not resume:
-        raise HTTPException(status_code=404, detail="Resume not found")
-
-    if section_name not in resume.content_json:
-        resume.content_json[section_name] = []
-    if not isinstance(resume.content_json[section_name], list):
+    index = ResumeService.append_item(db, resume_id, current_user.id, section_name, item)
+    if index is None:
+        exists, _ = ResumeService.section_state(db, resume_id, current_user.id, section_name)
+        if not exists:
+            raise HTTPException(status_code=404, detail="Resume not found")
         raise HTTPException(status_code=400, detail="Section is not a list")
-
-    resume.content_json[section_name].append(item)
     db.commit()
-    db.refresh(resume)
-    return {"message": f"Item added to section {section_name}"}
+    return {"message": f"Item added to section {section_name}", "index": index}
 
 @router.put("/{resume_id}/sections/{section_name}/items/{index}")
 def update_resume_section_item(resume_id: uuid.UUID, section_name: str, index: int, item: Dict[str, Any], db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
-    if not resume:
-        raise HTTPException(status_code=404, detail="Resume not found")
-
-    if section_name not in resume.content_json or not isinstance(resume.content_json[section_name], list):
-        raise HTTPException(status_code=400, detail="Section not found or not a list")
-
-    if index < 0 or index >= len(resume.content_json[section_name]):
-        raise HTTPException(status_code=404, detail="Item index out of range")
-
-    resume.content_json[section_name][index] = item
+    # Postgres would read a negative index from the end of the list
+    if index < 0 or not ResumeService.set_item(db, resume_id, current_user.id, section_name, index, item):
+        _raise_section_item_error(db, resume_id, current_user.id, section_name)
     db.commit()
-    db.refresh(resume)
     return {"message": f"Item {index} in section {section_name} updated"}
 
 @router.delete("/{resume_id}/sections/{section_name}/items/{index}")
 def delete_resume_section_item(resume_id: uuid.UUID, section_name: str, index: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
-    if not resume:
-        raise HTTPException(status_code=404, detail="Resume not found")
-
-    if section_name not in resume.content_json or not isinstance(resume.content_json[section_name], list):
-        raise HTTPException(status_code=400, detail="Section not found or not a list")
-
-    if index < 0 or index >= len(resume.content_json[section_name]):
-        raise HTTPException(status_code=404, detail="Item index out of range")
-
-    del resume.content_json[section_name][index]
+    if index < 0 or not ResumeService.delete_item(db, resume_id, current_user.id, section_name, index):
+        _raise_section_item_error(db, resume_id, current_user.id, section_name)
     db.commit()
-    db.refresh(resume)
     return {"message": f"Item {index} in section {section_name} deleted"}
+
+def _raise_section_item_error(db: Session, resume_id: uuid.UUID, user_id: uuid.UUID, section_name: str) -> None:
+    """Explain why an item edit matched no row, with the same errors as before."""
+    exists, length = ResumeService.section_state(db, resume_id, user_id, section_name)
+    if not exists:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    if length is None:
+        raise HTTPException(status_code=400, detail="Section not found or not a list")
+    raise HTTPException(status_code=404, detail="Item index out of range")
@@ -0,0 +1,99 @@
+import uuid
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import TEXT, case, cast, func, literal, or_, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array
+from sqlalchemy.orm import Session
+from app.modules.resumes.models import Resume
+
+
+def _jsonb(value: Any):
+    return cast(literal(value, JSONB), JSONB)
+
+
+def _path(*keys: Any):
+    return cast(array([str(key) for key in keys]), ARRAY(TEXT))
+
+
+class ResumeService:
+    """
+    Section edits applied inside Postgres with jsonb_set / || / #- in a single
+    UPDATE ... RETURNING. Only the patch is sent, nothing is read back beyond
+    the returned scalar, and each edit applies to the row's current document,
+    so concurrent edits to different sections do not overwrite each other.
+    Every method returns None when no row matched (missing resume, or the
+    section/index precondition failed); see section_state to tell which.
+    """
+
+    @staticmethod
+    def set_section(db: Session, resume_id: uuid.UUID, user_id: uuid.UUID, section_name: str, value: Any) -> Optional[uuid.UUID]:
+        stmt = (
+            update(Resume)
+            .where(Resume.id == resume_id, Resume.user_id == user_id)
+            .values(content_json=func.jsonb_set(Resume.content_json, _path(section_name), _jsonb(value), True))
+            .returning(Resume.id)
+            .execution_options(synchronize_session=False)
+        )
+        return db.execute(stmt).scalar()
+
+    @staticmethod
+    def append_item(db: Session, resume_id: uuid.UUID, user_id: uuid.UUID, section_name: str, item: Dict[str, Any]) -> Optional[int]:
+        """Append to a list section, creating it when missing. Returns the new item's index."""
+        section = Resume.content_json[section_name]
+        new_section = func.coalesce(section, _jsonb([])).op("||")(func.jsonb_build_array(_jsonb(item)))
+        stmt = (
+            update(Resume)
+            .where(
+                Resume.id == resume_id,
+                Resume.user_id == user_id,
+                or_(section.is_(None), func.jsonb_typeof(section) == "array"),
+            )
+            .values(content_json=func.jsonb_set(Resume.content_json, _path(section_name), new_section, True))
+            .returning(func.jsonb_array_length(Resume.content_json[section_name]) - 1)
+            .execution_options(synchronize_session=False)
+        )
+        return db.execute(stmt).scalar()
+
+    @staticmethod
+    def set_item(db: Session, resume_id: uuid.UUID, user_id: uuid.UUID, section_name: str, index: int, item: Dict[str, Any]) -> Optional[uuid.UUID]:
+        stmt = (
+            update(Resume)
+            .where(Resume.id == resume_id, Resume.user_id == user_id, ResumeService._has_index(section_name, index))
+            .values(content_json=func.jsonb_set(Resume.content_json, _path(section_name, index), _jsonb(item), False))
+            .returning(Resume.id)
+            .execution_options(synchronize_session=False)
+        )
+        return db.execute(stmt).scalar()
+
+    @staticmethod
+    def delete_item(db: Session, resume_id: uuid.UUID, user_id: uuid.UUID, section_name: str, index: int) -> Optional[uuid.UUID]:
+        stmt = (
+            update(Resume)
+            .where(Resume.id == resume_id, Resume.user_id == user_id, ResumeService._has_index(section_name, index))
+            .values(content_json=Resume.content_json.op("#-")(_path(section_name, index)))
+            .returning(Resume.id)
+            .execution_options(synchronize_session=False)
+        )
+        return db.execute(stmt).scalar()
+
+    @staticmethod
+    def section_state(db: Session, resume_id: uuid.UUID, user_id: uuid.UUID, section_name: str) -> Tuple[bool, Optional[int]]:
+        """
+        (resume exists, section length), where the length is None when the
+        section is missing or not a list. Only used to explain a failed edit.
+        """
+        section = Resume.content_json[section_name]
+        row = (
+            db.query(case((func.jsonb_typeof(section) == "array", func.jsonb_array_length(section)), else_=None))
+            .filter(Resume.id == resume_id, Resume.user_id == user_id)
+            .first()
+        )
+        if row is None:
+            return False, None
+        return True, row[0]
+
+    @staticmethod
+    def _has_index(section_name: str, index: int):
+        section = Resume.content_json[section_name]
+        # CASE guards jsonb_array_length, which raises on non-arrays
+        length = case((func.jsonb_typeof(section) == "array", func.jsonb_array_length(section)), else_=-1)
+        return length > index
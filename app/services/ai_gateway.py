@@ -0,0 +1,285 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.prompt_context import estimate_tokens
+
+MODEL_NAME = 'gemini-pro'
+
+# Provider errors worth retrying: rate limiting, overload and transient server faults
+_RETRYABLE_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    asyncio.TimeoutError,
+)
+
+
+class AIServiceError(Exception):
+    """Raised when the AI provider fails to produce a response."""
+
+
+class AITimeoutError(AIServiceError):
+    """Raised when an AI call does not finish within its timeout."""
+
+
+class AIRateLimitError(AIServiceError):
+    """Raised when a call is over the local rate limit or the provider's quota."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AIUnavailableError(AIServiceError):
+    """Raised without calling the provider while the circuit breaker is open."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Allows `rate` calls per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def refund(self) -> None:
+        """Give back a token taken for a call that was then rejected elsewhere."""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive provider failures and rejects
+    calls for reset_seconds. Then a single probe call is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def release_probe(self) -> None:
+        """Free the half-open probe slot of a call that ended without a verdict (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+                logger.warning(f"AI circuit breaker opened after {self.consecutive_failures} consecutive failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class AIGateway:
+    """
+    Single entry point for LLM calls.
+
+    Each call passes, in order: the per-user and global token buckets, the
+    circuit breaker, and the in-flight concurrency cap. Transient provider errors
+    are retried with jittered exponential backoff. Token usage and estimated
+    cost are counted per user. The model is injected, so a local fake with an
+    async generate_content_async(prompt) can stand in for the provider.
+    """
+
+    def __init__(self, model: Any):
+        self.model = model
+        self._slots = asyncio.Semaphore(settings.ai_max_concurrent_calls)
+        self._global_bucket = TokenBucket(settings.ai_rate_limit_per_second, settings.ai_rate_limit_burst)
+        self._user_buckets: "OrderedDict[Any, TokenBucket]" = OrderedDict()
+        self.breaker = CircuitBreaker(settings.ai_circuit_failure_threshold, settings.ai_circuit_reset_seconds)
+        self._usage: "OrderedDict[Any, Dict[str, float]]" = OrderedDict()
+        self._totals = self._new_usage()
+        self._retries = 0
+        self._rate_limited = 0
+        self._short_circuited = 0
+
+    async def generate(self, prompt: str, user_id: Any = None, timeout: Optional[float] = None) -> str:
+        """
+        Return the model's text for prompt.
+        Raises AIRateLimitError, AIUnavailableError, AITimeoutError or AIServiceError.
+        """
+        timeout = timeout or settings.ai_call_timeout_seconds
+        user_bucket = self._user_bucket(user_id) if user_id is not None else None
+        if user_bucket is not None:
+            await self._acquire(user_bucket, "Too many AI requests for this user")
+        try:
+            await self._acquire(self._global_bucket, "AI request rate limit reached")
+        except BaseException:
+            # Rejected or cancelled before the call: it must not count against the user's own limit
+            if user_bucket is not None:
+                user_bucket.refund()
+            raise
+
+        attempts = max(1, settings.ai_retry_attempts)
+        for attempt in range(1, attempts + 1):
+            if not self.breaker.allow():
+                self._short_circuited += 1
+                raise AIUnavailableError("AI provider is unavailable, try again later", self.breaker.retry_after())
+            probing = self.breaker.state == "half_open"
+            try:
+                response = await asyncio.wait_for(self._call(prompt), timeout)
+            except _RETRYABLE_ERRORS as e:
+                self.breaker.record_failure()
+                if attempt == attempts:
+                    raise self._final_error(e, timeout)
+                self._retries += 1
+                delay = random.uniform(0, min(settings.ai_retry_max_delay_seconds, settings.ai_retry_base_delay_seconds * 2 ** (attempt - 1)))
+                logger.warning(f"AI call attempt {attempt} failed ({type(e).__name__}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            except Exception as e:
+                # Bad request, blocked prompt, ...: the provider is up, so neither retry nor trip the breaker
+                self.breaker.record_success()
+                raise AIServiceError(f"AI call failed: {e}")
+            except BaseException:
+                # Cancelled (client went away, request timeout, ...): the provider's health is
+                # unknown, so neither verdict is recorded, but a half-open probe must free its slot
+                if probing:
+                    self.breaker.release_probe()
+                raise
+
+            self.breaker.record_success()
+            try:
+                text = response.text
+            except ValueError as e:
+                # Raised by the SDK when the candidate was blocked or empty
+                raise AIServiceError(f"AI response has no text: {e}")
+            self._record_usage(user_id, prompt, text, response)
+            return text
+
+    async def _call(self, prompt: str) -> Any:
+        async with self._slots:
+            return await self.model.generate_content_async(prompt)
+
+    async def _acquire(self, bucket: TokenBucket, message: str) -> None:
+        """Wait for a token up to ai_rate_limit_max_wait_seconds, else raise AIRateLimitError."""
+        deadline = time.monotonic() + settings.ai_rate_limit_max_wait_seconds
+        while True:
+            wait = bucket.take()
+            if wait == 0:
+                return
+            if time.monotonic() + wait > deadline:
+                self._rate_limited += 1
+                raise AIRateLimitError(message, retry_after=wait)
+            await asyncio.sleep(wait)
+
+    def _user_bucket(self, user_id: Any) -> TokenBucket:
+        bucket = self._user_buckets.get(user_id)
+        if bucket is None:
+            bucket = TokenBucket(settings.ai_user_rate_limit_per_second, settings.ai_user_rate_limit_burst)
+            self._user_buckets[user_id] = bucket
+            if len(self._user_buckets) > settings.ai_tracked_users:
+                self._user_buckets.popitem(last=False)
+        else:
+            self._user_buckets.move_to_end(user_id)
+        return bucket
+
+    @staticmethod
+    def _final_error(error: BaseException, timeout: float) -> AIServiceError:
+        if isinstance(error, asyncio.TimeoutError):
+            return AITimeoutError(f"AI call timed out after {timeout} seconds")
+        if isinstance(error, google_exceptions.TooManyRequests):
+            return AIRateLimitError(f"AI provider quota exceeded: {error}", retry_after=settings.ai_retry_max_delay_seconds)
+        return AIServiceError(f"AI provider error: {error}")
+
+    @staticmethod
+    def _new_usage() -> Dict[str, float]:
+        return {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+
+    def _record_usage(self, user_id: Any, prompt: str, text: str, response: Any) -> None:
+        metadata = getattr(response, "usage_metadata", None)
+        input_tokens = getattr(metadata, "prompt_token_count", None) or estimate_tokens(prompt)
+        output_tokens = getattr(metadata, "candidates_token_count", None) or estimate_tokens(text)
+        cost = (
+            input_tokens / 1000 * settings.ai_cost_per_1k_input_tokens
+            + output_tokens / 1000 * settings.ai_cost_per_1k_output_tokens
+        )
+
+        counters = [self._totals]
+        if user_id is not None:
+            usage = self._usage.get(user_id)
+            if usage is None:
+                usage = self._usage[user_id] = self._new_usage()
+                if len(self._usage) > settings.ai_tracked_users:
+                    self._usage.popitem(last=False)
+            else:
+                self._usage.move_to_end(user_id)
+            counters.append(usage)
+        for usage in counters:
+            usage["calls"] += 1
+            usage["input_tokens"] += input_tokens
+            usage["output_tokens"] += output_tokens
+            usage["cost_usd"] += cost
+
+    def usage(self, user_id: Any) -> Dict[str, float]:
+        """Token and cost counters for one user since process start."""
+        usage = dict(self._usage.get(user_id) or self._new_usage())
+        usage["cost_usd"] = round(usage["cost_usd"], 6)
+        return usage
+
+    def stats(self) -> Dict[str, Any]:
+        totals = dict(self._totals)
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        return {
+            "circuit_state": self.breaker.state,
+            "circuit_opened": self.breaker.times_opened,
+            "short_circuited": self._short_circuited,
+            "rate_limited": self._rate_limited,
+            "retries": self._retries,
+            "tracked_users": len(self._usage),
+            "usage": totals,
+        }
+
+
+genai.configure(api_key=settings.gemini_api_key)
+ai_gateway = AIGateway(genai.GenerativeModel(MODEL_NAME))
@@ -1,31 +1,288 @@
-import google.generativeai as genai
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, Union
 from app.core.config import settings
+from app.core.logging import logger
+from app.services.ai_cache import ai_response_cache
+from app.services.ai_gateway import MODEL_NAME, AIServiceError, ai_gateway
+from app.services.prompt_context import build_resume_context
+
+# Bump when a prompt changes so cached responses to the old prompt are not reused
+ANALYSIS_PROMPT_VERSION = "2"
+PREP_KIT_PROMPT_VERSION = "3"
+
+_ENHANCE_FORMAT = '{"items": ["<enhanced text>", ...]}'
+_QA_FORMAT = '{"questions": [{"question": "...", "answer": "..."}]}'
+
+# JobPrepKit column -> what to generate, the JSON shape to answer with, and the
+# top-level key that must be present. Text columns store that key's string;
+# JSONB columns store the whole parsed object.
+PREP_KIT_SECTIONS = {
+    "email_draft": {
+        "instruction": "a short email to the recruiter or hiring manager expressing interest in the role",
+        "format": '{"text": "<subject line and email body>"}',
+        "key": "text",
+    },
+    "cover_letter": {
+        "instruction": "a cover letter tailored to the job description",
+        "format": '{"text": "<cover letter>"}',
+        "key": "text",
+    },
+    "hr_questions": {
+        "instruction": "8-10 likely HR interview questions with suggested answers",
+        "format": _QA_FORMAT,
+        "key": "questions",
+    },
+    "managerial_questions": {
+        "instruction": "6-8 likely managerial and behavioural interview questions with suggested answers",
+        "format": _QA_FORMAT,
+        "key": "questions",
+    },
+    "technical_questions": {
+        "instruction": "8-10 likely technical interview questions for this role with concise answers",
+        "format": _QA_FORMAT,
+        "key": "questions",
+    },
+    "dsa_questions": {
+        "instruction": "4-6 DSA interview questions relevant to the role, with solutions in C++, Java and Python",
+        "format": '{"questions": [{"question": "...", "difficulty": "easy|medium|hard", '
+                  '"solutions": {"cpp": "...", "java": "...", "python": "..."}}]}',
+        "key": "questions",
+    },
+    "puzzles": {
+        "instruction": "3-5 puzzles commonly asked in interviews for this role, with solutions",
+        "format": '{"puzzles": [{"puzzle": "...", "solution": "..."}]}',
+        "key": "puzzles",
+    },
+}
+
+class AIResponseFormatError(AIServiceError):
+    """Raised when the model's answer does not match the requested JSON format."""
 
-genai.configure(api_key=settings.gemini_api_key)
-model = genai.GenerativeModel('gemini-pro')
 
 class AIService:
     @staticmethod
-    async def enhance_text(text: str, context: str = "") -> str:
+    async def _generate(prompt: str, user_id: Any = None, timeout: Optional[float] = None) -> str:
+        """
+        Run one generation through the AI gateway (rate limits, retries, circuit breaker,
+        usage accounting for user_id) on the model's native async API.
+        """
+        return await ai_gateway.generate(prompt, user_id=user_id, timeout=timeout)
+
+    @staticmethod
+    async def _cached(cache_key: str, use_cache: bool, produce: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached response for cache_key, or produce and store it.
+        use_cache=False skips the lookup but still refreshes the stored entry.
+        """
+        if not settings.ai_cache_enabled:
+            return await produce()
+        if use_cache:
+            cached = await asyncio.to_thread(ai_response_cache.get, cache_key)
+            if cached is not None:
+                return cached
+        result = await produce()
+        await asyncio.to_thread(ai_response_cache.set, cache_key, result)
+        return result
+
+    @staticmethod
+    def resume_context(resume_content: dict) -> str:
+        """Compact resume text for prompts, trimmed to settings.ai_prompt_token_budget."""
+        context = build_resume_context(resume_content, settings.ai_prompt_token_budget)
+        logger.info(
+            f"Resume prompt context: ~{context.tokens_before} -> ~{context.tokens_after} tokens"
+            + (" (trimmed to budget)" if context.trimmed else "")
+        )
+        return context.text
+
+    @staticmethod
+    async def enhance_text(text: str, context: str = "", user_id: Any = None) -> str:
         prompt = f"Enhance the following text for a resume {context}: {text}"
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        response_text = await AIService._generate(prompt, user_id)
+        return response_text.strip()
+
+    @staticmethod
+    async def enhance_many(items: List[Tuple[str, str]], user_id: Any = None) -> List[str]:
+        """
+        Enhance many (text, context) pairs, settings.ai_enhance_batch_size per prompt,
+        with at most settings.ai_enhance_concurrency prompts in flight. Results keep the
+        input order. Items a batch answer leaves out or garbles are enhanced one by one;
+        an item whose enhancement fails falls back to its original text.
+        """
+        limit = asyncio.Semaphore(settings.ai_enhance_concurrency)
+        batch_size = max(1, settings.ai_enhance_batch_size)
+
+        async def enhance(text: str, context: str) -> str:
+            async with limit:
+                try:
+                    return await AIService.enhance_text(text, context, user_id)
+                except Exception as e:
+                    logger.warning(f"AI enhancement failed, keeping original text: {e}")
+                    return text
+
+        async def enhance_batch(batch: List[Tuple[str, str]]) -> List[str]:
+            if len(batch) == 1:
+                return [await enhance(*batch[0])]
+            prompt = (
+                "Enhance each of the following texts for a resume. "
+                f"Respond with only a JSON object in exactly this format, without markdown: {_ENHANCE_FORMAT}, "
+                "with one entry per item, in the same order.\n"
+                f"Items: {json.dumps([{'text': text, 'context': context} for text, context in batch], ensure_ascii=False)}"
+            )
+            try:
+                async with limit:
+                    enhanced = AIService._parse_enhanced(await AIService._generate(prompt, user_id), len(batch))
+            except AIResponseFormatError as e:
+                logger.warning(f"Batch AI enhancement answer unusable, enhancing items one by one: {e}")
+                enhanced = [None] * len(batch)
+            except Exception as e:
+                # Rate limited, provider down, ...: one call per item would fail the same way
+                logger.warning(f"Batch AI enhancement failed, keeping original texts: {e}")
+                return [text for text, _ in batch]
+
+            missing = [index for index, text in enumerate(enhanced) if text is None]
+            fallbacks = await asyncio.gather(*(enhance(*batch[index]) for index in missing))
+            for index, text in zip(missing, fallbacks):
+                enhanced[index] = text
+            return enhanced
+
+        batches = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+        results = await asyncio.gather(*(enhance_batch(batch) for batch in batches))
+        return [text for batch in results for text in batch]
+
+    @staticmethod
+    def _parse_enhanced(response_text: str, count: int) -> List[Optional[str]]:
+        """
+        Parse a batch enhancement answer into count texts, None for each entry that is
+        not a non-empty string. Raises AIResponseFormatError if the answer is unusable.
+        """
+        data = AIService._load_json("enhancement", response_text)
+        value = data.get("items") if isinstance(data, dict) else None
+        if not isinstance(value, list) or len(value) != count:
+            raise AIResponseFormatError(f"enhancement: expected an 'items' list of {count} texts")
+        return [text.strip() if isinstance(text, str) and text.strip() else None for text in value]
 
     @staticmethod
-    async def analyze_resume(resume_content: dict, job_desc: str = None) -> dict:
+    async def analyze_resume(
+        resume_content: dict, job_desc: str = None, use_cache: bool = True, user_id: Any = None
+    ) -> dict:
+        resume_text = AIService.resume_context(resume_content)
         if job_desc:
-            prompt = f"Analyze this resume against the job description and suggest improvements: Resume: {resume_content} Job: {job_desc}"
+            prompt = f"Analyze this resume against the job description and suggest improvements: Resume:\n{resume_text}\nJob: {job_desc}"
         else:
-            prompt = f"Provide a general analysis of this resume: {resume_content}"
-        
-        response = model.generate_content(prompt)
-        return {"analysis": response.text.strip()}
-
-    @staticmethod
-    async def generate_prep_kit(resume: dict, job_desc: dict, experience: str) -> dict:
-        prompt = f"Generate a job preparation kit based on resume: {resume}, job description: {job_desc}, experience: {experience}. Include email draft, cover letter, HR questions, managerial questions, technical questions, DSA questions with solutions in C++/Java/Python, puzzles."
-        
-        response = model.generate_content(prompt)
-        content = response.text
-        # Parse the response into structured format
-        return {"kit": content}  # Placeholder, need to parse properly
\ No newline at end of file
+            prompt = f"Provide a general analysis of this resume:\n{resume_text}"
+
+        async def produce() -> dict:
+            response_text = await AIService._generate(prompt, user_id)
+            return {"analysis": response_text.strip()}
+
+        cache_key = ai_response_cache.make_key(
+            MODEL_NAME, ANALYSIS_PROMPT_VERSION, resume=resume_text, job_description=job_desc
+        )
+        return await AIService._cached(cache_key, use_cache, produce)
+
+    @staticmethod
+    async def generate_prep_kit(
+        resume: dict, job_desc: dict, experience: str, use_cache: bool = True, user_id: Any = None
+    ) -> dict:
+        """
+        Generate every JobPrepKit section in parallel, one schema-constrained prompt per section.
+        Returns column -> parsed value for the sections that succeeded, plus
+        meta.failed_sections listing the ones that still failed after retries.
+        """
+        # Serialize once instead of once per section
+        resume_text = AIService.resume_context(resume)
+        results = await asyncio.gather(
+            *(AIService.generate_prep_kit_section(section, resume_text, job_desc, experience, use_cache, user_id)
+              for section in PREP_KIT_SECTIONS),
+            return_exceptions=True
+        )
+
+        kit = {}
+        failed_sections = []
+        for section, result in zip(PREP_KIT_SECTIONS, results):
+            # BaseException: a section whose task was cancelled counts as failed too
+            if isinstance(result, BaseException):
+                logger.warning(f"Prep kit section {section} failed: {result!r}")
+                failed_sections.append(section)
+            else:
+                kit[section] = result
+        if failed_sections and len(failed_sections) == len(PREP_KIT_SECTIONS):
+            # Nothing to save: surface the cause (rate limit, provider outage, ...) instead
+            cause = next((result for result in results if isinstance(result, Exception)), None)
+            raise cause or AIServiceError("Every prep kit section was cancelled")
+        kit["meta"] = {"failed_sections": failed_sections}
+        return kit
+
+    @staticmethod
+    async def generate_prep_kit_section(
+        section: str,
+        resume: Union[dict, str],
+        job_desc: str,
+        experience: str,
+        use_cache: bool = True,
+        user_id: Any = None
+    ) -> Any:
+        """
+        Generate a single JobPrepKit section (one of PREP_KIT_SECTIONS) with its own smaller prompt,
+        parsed into the column's type. Only this section is retried, up to
+        settings.ai_prep_kit_section_attempts times, when the answer is malformed; call failures
+        are retried by the gateway and raised as they are.
+        resume is content_json or text already built by resume_context.
+        """
+        spec = PREP_KIT_SECTIONS[section]
+        resume_text = resume if isinstance(resume, str) else AIService.resume_context(resume)
+        prompt = (
+            f"Based on resume:\n{resume_text}\nJob description: {job_desc}, experience: {experience}. "
+            f"Write {spec['instruction']}. "
+            f"Respond with only a JSON object in exactly this format, without markdown: {spec['format']}"
+        )
+
+        async def produce() -> Any:
+            return AIService._parse_section(section, await AIService._generate(prompt, user_id))
+
+        cache_key = ai_response_cache.make_key(
+            MODEL_NAME, PREP_KIT_PROMPT_VERSION, section=section, resume=resume_text, job_description=job_desc, experience=experience
+        )
+
+        attempts = max(1, settings.ai_prep_kit_section_attempts)
+        for attempt in range(1, attempts + 1):
+            try:
+                # Only successfully parsed sections are stored in the cache
+                return await AIService._cached(cache_key, use_cache, produce)
+            except AIResponseFormatError as e:
+                # Every other gateway error was already retried (or rejected) by AIGateway.generate
+                if attempt == attempts:
+                    raise
+                logger.warning(f"Prep kit section {section} attempt {attempt} failed, retrying: {e}")
+
+    @staticmethod
+    def _parse_section(section: str, response_text: str) -> Any:
+        """Parse a section answer into its column value, or raise AIResponseFormatError."""
+        spec = PREP_KIT_SECTIONS[section]
+        data = AIService._load_json(section, response_text)
+        if not isinstance(data, dict) or spec["key"] not in data:
+            raise AIResponseFormatError(f"{section}: response has no '{spec['key']}' field")
+
+        value = data[spec["key"]]
+        if spec["key"] == "text":
+            if not isinstance(value, str) or not value.strip():
+                raise AIResponseFormatError(f"{section}: '{spec['key']}' must be a non-empty string")
+            return value.strip()
+        if not isinstance(value, list) or not value or not all(isinstance(item, dict) for item in value):
+            raise AIResponseFormatError(f"{section}: '{spec['key']}' must be a non-empty list of objects")
+        return {spec["key"]: value}
+
+    @staticmethod
+    def _load_json(label: str, response_text: str) -> Any:
+        """Decode a JSON answer, or raise AIResponseFormatError."""
+        text = response_text.strip()
+        # Models often wrap JSON in a ```json fence despite being asked not to
+        if text.startswith("```"):
+            text = text.split("\n", 1)[1] if "\n" in text else ""
+            text = text.rsplit("```", 1)[0]
+
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise AIResponseFormatError(f"{label}: response is not valid JSON ({e})")
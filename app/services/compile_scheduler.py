@@ -0,0 +1,115 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from app.core.config import settings
+
+
+class CompileQueueFull(Exception):
+    """Raised when the compile queue is at capacity and a job cannot be accepted."""
+
+
+class CompileScheduler:
+    """
+    Bounded scheduler for blocking PDF compile jobs.
+
+    At most max_workers jobs run at once (each one drives a pdflatex or HTTP
+    compile), at most max_queue jobs wait behind them, and further submissions
+    raise CompileQueueFull. Jobs submitted under a key that is already queued
+    or running share the existing Future instead of compiling again.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf-compile")
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._deduplicated = 0
+        self._rejected = 0
+        self._failed = 0
+        self._completed = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._compile_seconds_total = 0.0
+        self._compile_seconds_max = 0.0
+
+    def submit(self, key: str, fn: Callable[..., Any], *args: Any) -> Future:
+        """
+        Queue fn(*args) under key and return its Future.
+        Raises CompileQueueFull when max_queue jobs are already waiting.
+        """
+        with self._lock:
+            existing = self._in_flight.get(key)
+            if existing is not None:
+                self._deduplicated += 1
+                return existing
+
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise CompileQueueFull(f"Compile queue is full ({self.max_queue} jobs waiting)")
+
+            self._queued += 1
+            self._submitted += 1
+            future = self._executor.submit(self._run, time.perf_counter(), fn, args)
+            self._in_flight[key] = future
+
+        future.add_done_callback(lambda f: self._finish(key, f))
+        return future
+
+    def _run(self, enqueued_at: float, fn: Callable[..., Any], args: tuple) -> Any:
+        started_at = time.perf_counter()
+        waited = started_at - enqueued_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self._running -= 1
+                self._compile_seconds_total += elapsed
+                self._compile_seconds_max = max(self._compile_seconds_max, elapsed)
+
+    def _finish(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            if future.cancelled():
+                # Cancelled before it started, so _run never dequeued it
+                self._queued -= 1
+                self._failed += 1
+            elif future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "submitted": self._submitted,
+                "deduplicated": self._deduplicated,
+                "rejected": self._rejected,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_wait_seconds": round(self._wait_seconds_total / started, 4) if started else 0.0,
+                "max_wait_seconds": round(self._wait_seconds_max, 4),
+                "avg_compile_seconds": round(self._compile_seconds_total / started, 4) if started else 0.0,
+                "max_compile_seconds": round(self._compile_seconds_max, 4),
+            }
+
+
+compile_scheduler = CompileScheduler(settings.pdf_compile_max_workers, settings.pdf_compile_queue_size)
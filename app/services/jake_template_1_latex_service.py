@@ -1,12 +1,307 @@
 from jinja2 import Environment
 import subprocess
+import hashlib
+import json
 import os
 import requests
 import re
-from typing import Dict, Any, List
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from app.core.config import settings
+
+# Bump whenever a renderer change alters the generated LaTeX, so that
+# content-addressed artifacts rendered by the old code are not reused.
+LATEX_RENDERER_VERSION = "1"
+
+# Lookup table for the single-pass escaper in LaTeXService._escape_latex.
+# The backslash maps to '\textbackslash\{\}' (braces escaped) to stay
+# byte-identical with the old chained str.replace implementation, where
+# the '{'/'}' replacements ran after the backslash replacement.
+_LATEX_ESCAPES = {
+    '\\': r'\textbackslash\{\}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\^{}',
+}
+_LATEX_SPECIAL_RE = re.compile(r'[\\&%$#_{}~^]')
+_LATEX_SPECIAL_NO_BACKSLASH_RE = re.compile(r'[&%$#_{}~^]')
+
+# Text containing one of these commands is treated as pre-formatted LaTeX
+# and its backslashes are left alone.
+_LATEX_COMMAND_RE = re.compile(r'\\(?:textbf|href|emph|textit)')
+
+
+def _latex_escape_match(match: re.Match) -> str:
+    return _LATEX_ESCAPES[match[0]]
+
+# {{VARIABLE_NAME}} placeholders; the capture group makes re.split return
+# alternating [static, name, static, name, ..., static] segments.
+_PLACEHOLDER_RE = re.compile(r'\{\{([A-Za-z0-9_]+)\}\}')
+
+HEADING_TEMPLATE_VARS = (
+    "FULL_NAME", "ADDRESS_LINE", "PHONE_NUMBER", "EMAIL_ADDRESS",
+    "LINKEDIN_URL", "LINKEDIN_USERNAME", "GITHUB_URL", "GITHUB_USERNAME", "ADDITIONAL_LINKS",
+)
+_HEADING_PLACEHOLDER_RE = re.compile(r'\{\{(' + '|'.join(HEADING_TEMPLATE_VARS) + r')\}\}')
+
+# From the first section header to the end of the last section
+_BODY_SECTIONS_RE = re.compile(r'%-----------EDUCATION-----------.*?(?=\\end\{document\})', re.DOTALL)
+BODY_SECTIONS_SLOT = "__BODY_SECTIONS__"
+
+
+class CompiledTemplate:
+    """
+    A preprocessed LaTeX template split into static chunks and placeholder slots.
+    Segments alternate [static, slot, static, ..., static], so rendering is a
+    single join and never rescans the template text.
+    """
+
+    __slots__ = ("segments", "custom_order_segments")
+
+    def __init__(self, template_content: str):
+        processed = LaTeXService._preprocess_template(template_content)
+
+        # Default order: every {{VARIABLE}} is a slot
+        self.segments = _PLACEHOLDER_RE.split(processed)
+
+        # Custom order: only heading variables are slots, and each body
+        # sections block is replaced by a single BODY_SECTIONS_SLOT
+        custom_segments: List[str] = []
+        for index, chunk in enumerate(_BODY_SECTIONS_RE.split(processed)):
+            if index:
+                custom_segments.append(BODY_SECTIONS_SLOT)
+            custom_segments.extend(_HEADING_PLACEHOLDER_RE.split(chunk))
+        self.custom_order_segments = custom_segments
+
+    @staticmethod
+    def render(segments: List[str], values: Dict[str, Any]) -> str:
+        """Fill the slots of a segment list; unknown placeholders are left as-is."""
+        parts = segments[:]
+        for index in range(1, len(parts), 2):
+            name = parts[index]
+            if name in values:
+                parts[index] = str(values[name])
+            else:
+                parts[index] = f"{{{{{name}}}}}"
+        return "".join(parts)
+
+
+class _TemplateCache:
+    """Process-local LRU of compiled templates keyed by (template_id, updated_at)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[int, Optional[datetime]], CompiledTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[int, Optional[datetime]], template_content: str) -> CompiledTemplate:
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                return compiled
+
+        compiled = CompiledTemplate(template_content)
+
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_template_cache = _TemplateCache(settings.latex_template_cache_size)
+
+
+class _SectionCache:
+    """
+    Process-local LRU of rendered section LaTeX.
+
+    Keys hash the renderer version, the template key, the section name and
+    the canonical JSON of that section's data, so editing one section only
+    re-renders that section; the others are reassembled from cached fragments.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(scope: Tuple[Any, ...], section_name: str, section_data: Any) -> str:
+        canonical = json.dumps(
+            [LATEX_RENDERER_VERSION, scope, section_name, section_data],
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get_or_render(self, key: str, render: Callable[[], str]) -> str:
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+
+        fragment = render()
+
+        with self._lock:
+            self._entries[key] = fragment
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return fragment
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+section_cache = _SectionCache(settings.latex_section_cache_size)
+
+
+def _time_left(deadline: Optional[float]) -> Optional[float]:
+    """Seconds until a time.monotonic() deadline (never negative), or None for no limit."""
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.symlink(os.path.abspath(src), dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+# How long a preamble whose format build failed goes without a retry
+_FORMAT_RETRY_SECONDS = 300
+
+
+class _PreambleFormatCache:
+    """
+    pdflatex format files (.fmt) holding a dumped template preamble.
+
+    Formats are built once per distinct preamble with mylatexformat and stored
+    on disk as preamble_{hash}.fmt, so a template version maps to one format
+    shared by every compile and every worker process. A document compiled with
+    -fmt=<format> skips its own preamble and only typesets the body.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._formats: Dict[str, str] = {}
+        # Preamble key -> time.monotonic() before which a failed build is not retried
+        self._failed_until: Dict[str, float] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, latex_content: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Return the format path for the document's preamble, building it if needed."""
+        preamble, begin, _ = latex_content.partition("\\begin{document}")
+        if not begin:
+            return None
+        key = hashlib.sha256(preamble.encode("utf-8")).hexdigest()[:16]
+
+        with self._lock:
+            if key in self._formats:
+                return self._formats[key]
+            if self._failed_until.get(key, 0.0) > time.monotonic():
+                return None
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        # One build per preamble; concurrent compiles wait for it
+        with build_lock:
+            with self._lock:
+                if key in self._formats:
+                    return self._formats[key]
+                if self._failed_until.get(key, 0.0) > time.monotonic():
+                    return None
+            format_path = self._build(key, preamble, timeout)
+            with self._lock:
+                if format_path:
+                    self._formats[key] = format_path
+                    self._failed_until.pop(key, None)
+                else:
+                    # Compiles take the cold path for a while, then the build is retried
+                    # (the failure may have been a timeout or a missing package since installed)
+                    self._failed_until[key] = time.monotonic() + _FORMAT_RETRY_SECONDS
+        return format_path
+
+    def _build(self, key: str, preamble: str, timeout: Optional[float]) -> Optional[str]:
+        format_name = f"preamble_{key}"
+        format_path = os.path.join(self.directory, f"{format_name}.fmt")
+        if os.path.exists(format_path):
+            return format_path
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with tempfile.TemporaryDirectory(prefix="latex_fmt_") as work_dir:
+                with open(os.path.join(work_dir, "preamble.tex"), "w", encoding="utf-8") as f:
+                    f.write(preamble + "\\begin{document}\n\\end{document}\n")
+
+                subprocess.run(
+                    ["pdflatex", "-ini", "-interaction=nonstopmode", f"-jobname={format_name}",
+                     "&pdflatex", "mylatexformat.ltx", "preamble.tex"],
+                    check=True,
+                    cwd=work_dir,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout
+                )
+
+                built_path = os.path.join(work_dir, f"{format_name}.fmt")
+                if not os.path.exists(built_path):
+                    return None
+                # Stage next to the target so the final rename is atomic
+                staged_path = os.path.join(self.directory, f".{format_name}.{uuid.uuid4().hex}.fmt")
+                shutil.move(built_path, staged_path)
+                os.replace(staged_path, format_path)
+            print(f"Built LaTeX preamble format {format_path}")
+            return format_path
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+            print(f"Could not build LaTeX preamble format, using full compiles: {str(e)}")
+            return None
+
+
+_preamble_formats = _PreambleFormatCache(settings.latex_format_dir)
 
 class LaTeXService:
-    
+
     @staticmethod
     def _escape_latex(text: str) -> str:
         """
@@ -15,68 +310,72 @@ class LaTeXService:
         """
         if not text:
             return ""
-        
+
         result = str(text)
-        
-        # Characters that need simple escaping (order matters!)
+
         # Don't escape backslash if it looks like a LaTeX command
-        if not ('\\' in result and any(cmd in result for cmd in ['\\textbf', '\\href', '\\emph', '\\textit'])):
-            result = result.replace('\\', r'\textbackslash{}')
-        
-        # Now escape other special characters
-        result = result.replace('&', r'\&')
-        result = result.replace('%', r'\%')
-        result = result.replace('$', r'\$')
-        result = result.replace('#', r'\#')
-        result = result.replace('_', r'\_')
-        result = result.replace('{', r'\{')
-        result = result.replace('}', r'\}')
-        result = result.replace('~', r'\textasciitilde{}')
-        result = result.replace('^', r'\^{}')
-        
-        return result
+        if '\\' in result and _LATEX_COMMAND_RE.search(result):
+            pattern = _LATEX_SPECIAL_NO_BACKSLASH_RE
+        else:
+            pattern = _LATEX_SPECIAL_RE
+
+        # Most resume text has nothing to escape; skip the substitution pass
+        if pattern.search(result) is None:
+            return result
+        return pattern.sub(_latex_escape_match, result)
     @staticmethod
-    def render_template(template_content: str, data: Dict[str, Any]) -> str:
+    def render_template(
+        template_content: str,
+        data: Dict[str, Any],
+        template_id: Optional[int] = None,
+        template_updated_at: Optional[datetime] = None,
+    ) -> str:
         """
         Render LaTeX template with data.
         Respects section_order if provided in data.
         Template variables should use {{VARIABLE_NAME}} format.
+        When template_id is given, the preprocessed template is cached per
+        (template_id, template_updated_at) so it is only parsed once.
+        Rendered sections are memoized (see _SectionCache), so only sections
+        whose data changed since an earlier render are rendered again.
         """
-        # Preprocess template to fix common issues
-        processed_template = LaTeXService._preprocess_template(template_content)
-        
+        compiled = LaTeXService._get_compiled_template(template_content, template_id, template_updated_at)
+        scope = (template_id, template_updated_at)
+
         # Check if custom section ordering is requested
         if "section_order" in data:
             # Build template with custom section order
-            rendered_content = LaTeXService._render_with_custom_order(processed_template, data)
-        else:
-            # Use default template order
-            rendered_content = processed_template
-            
-            # Map JSON structure to template variables
-            template_vars = LaTeXService._map_json_to_template_vars(data)
-            
-            # Replace all template variables
-            for var_name, var_value in template_vars.items():
-                placeholder = f"{{{{{var_name}}}}}"
-                rendered_content = rendered_content.replace(placeholder, str(var_value))
-        
-        return rendered_content
-    
+            return LaTeXService._render_with_custom_order(compiled, data, scope)
+
+        # Use default template order: map JSON structure to template variables
+        template_vars = LaTeXService._map_json_to_template_vars(data, scope)
+        return compiled.render(compiled.segments, template_vars)
+
+    @staticmethod
+    def _get_compiled_template(
+        template_content: str,
+        template_id: Optional[int] = None,
+        template_updated_at: Optional[datetime] = None,
+    ) -> "CompiledTemplate":
+        """Return the preprocessed template, from the cache when it is keyed."""
+        if template_id is None:
+            return CompiledTemplate(template_content)
+        return _template_cache.get((template_id, template_updated_at), template_content)
+
     @staticmethod
-    def _render_with_custom_order(template_content: str, data: Dict[str, Any]) -> str:
+    def _render_with_custom_order(compiled: "CompiledTemplate", data: Dict[str, Any], scope: Tuple[Any, ...] = ()) -> str:
         """
         Render template with custom section ordering.
         Completely dynamic - supports any section type.
         """
-        # Map JSON to template variables for predefined sections
-        template_vars = LaTeXService._map_json_to_template_vars(data)
+        # Only the heading variables are used here; sections are rendered below
+        template_vars = LaTeXService._map_heading_to_template_vars(data)
         
         # Get custom section order
         section_order = data.get("section_order", ["education", "experience", "projects", "skills", "certifications", "leadership"])
         
         # Build ordered sections dynamically
-        ordered_sections = ""
+        ordered_sections = []
         
         for section_name in section_order:
             # Skip non-section fields
@@ -94,31 +393,22 @@ class LaTeXService:
                 continue
             
             # Render section based on data structure
-            section_latex = LaTeXService._render_section_dynamically(section_name, section_data, template_vars)
+            section_latex = section_cache.get_or_render(
+                section_cache.make_key(scope, f"dynamic:{section_name}", section_data),
+                lambda: LaTeXService._render_section_dynamically(section_name, section_data, template_vars)
+            )
             
             if section_latex:
-                ordered_sections += section_latex + "\n"
-        
-        # Replace the body sections in template
-        import re
-        
-        # Pattern to match from first section header to end of last section
-        pattern = r'%-----------EDUCATION-----------.*?(?=\\end\{document\})'
-        
-        # Replace heading variables first
-        result = template_content
-        for var in ["FULL_NAME", "ADDRESS_LINE", "PHONE_NUMBER", "EMAIL_ADDRESS", 
-                    "LINKEDIN_URL", "LINKEDIN_USERNAME", "GITHUB_URL", "GITHUB_USERNAME", "ADDITIONAL_LINKS"]:
-            placeholder = f"{{{{{var}}}}}"
-            result = result.replace(placeholder, str(template_vars.get(var, "")))
+                ordered_sections.append(section_latex)
+                ordered_sections.append("\n")
         
-        # Replace the sections with ordered sections
-        def replace_func(match):
-            return ordered_sections + "\n"
+        # Heading variables default to empty; the body sections (from the
+        # first section header to \end{document}) become the ordered sections
+        slot_values = {var: str(template_vars.get(var, "")) for var in HEADING_TEMPLATE_VARS}
+        ordered_sections.append("\n")
+        slot_values[BODY_SECTIONS_SLOT] = "".join(ordered_sections)
         
-        result = re.sub(pattern, replace_func, result, flags=re.DOTALL)
-        
-        return result
+        return compiled.render(compiled.custom_order_segments, slot_values)
     
     @staticmethod
     def _render_section_dynamically(section_name: str, section_data: Any, template_vars: Dict[str, str]) -> str:
@@ -132,15 +422,15 @@ class LaTeXService:
         """
         # Generate title from section name
         title = section_name.replace("_", " ").title()
-        section_latex = f"\n%-----------{title.upper()}-----------\n"
-        section_latex += f"\\section{{{title}}}\n"
+        parts = [f"\n%-----------{title.upper()}-----------\n"]
+        parts.append(f"\\section{{{title}}}\n")
         
         # Render based on data type
         if isinstance(section_data, str):
             # Simple text section
             escaped_text = LaTeXService._escape_latex(section_data)
-            section_latex += f"{escaped_text}\n"
-            section_latex += "\\vspace{-8pt}\n"
+            parts.append(f"{escaped_text}\n")
+            parts.append("\\vspace{-8pt}\n")
         
         elif isinstance(section_data, list):
             if not section_data:
@@ -149,41 +439,41 @@ class LaTeXService:
             # Check if it's a list of dicts or list of strings
             if isinstance(section_data[0], dict):
                 # Structured list - detect type and render accordingly
-                section_latex += LaTeXService._render_structured_list(section_name, section_data)
+                parts.append(LaTeXService._render_structured_list(section_name, section_data))
             else:
                 # Simple list of strings
-                section_latex += "\\begin{itemize}[leftmargin=0.15in]\n"
+                parts.append("\\begin{itemize}[leftmargin=0.15in]\n")
                 for item in section_data:
                     if isinstance(item, str):
                         escaped_item = LaTeXService._escape_latex(item)
-                        section_latex += f"  \\item {escaped_item}\n"
-                section_latex += "\\end{itemize}\n"
-                section_latex += "\\vspace{-8pt}\n"
+                        parts.append(f"  \\item {escaped_item}\n")
+                parts.append("\\end{itemize}\n")
+                parts.append("\\vspace{-8pt}\n")
         
         elif isinstance(section_data, dict):
             # Check if it's a skills-like structure with categories
             if "categories" in section_data:
-                section_latex += " \\begin{itemize}[leftmargin=0.15in, label={}]\n"
-                section_latex += "    \\small{\\item{\n"
+                parts.append(" \\begin{itemize}[leftmargin=0.15in, label={}]\n")
+                parts.append("    \\small{\\item{\n")
                 for category in section_data["categories"]:
                     name = category.get("name", "")
                     items = category.get("items", [])
                     items_string = ", ".join([LaTeXService._escape_latex(str(i)) for i in items])
-                    section_latex += f"     \\textbf{{{name}}}{{: {items_string}}} \\\\\n"
-                section_latex += "    }}\n"
-                section_latex += " \\end{itemize}\n"
-                section_latex += "\\vspace{-16pt}\n"
+                    parts.append(f"     \\textbf{{{name}}}{{: {items_string}}} \\\\\n")
+                parts.append("    }}\n")
+                parts.append(" \\end{itemize}\n")
+                parts.append("\\vspace{-16pt}\n")
             else:
                 # Generic dict - render key-value pairs
-                section_latex += "\\begin{itemize}[leftmargin=0.15in]\n"
+                parts.append("\\begin{itemize}[leftmargin=0.15in]\n")
                 for key, value in section_data.items():
                     escaped_key = LaTeXService._escape_latex(str(key))
                     escaped_value = LaTeXService._escape_latex(str(value))
-                    section_latex += f"  \\item \\textbf{{{escaped_key}}}: {escaped_value}\n"
-                section_latex += "\\end{itemize}\n"
-                section_latex += "\\vspace{-8pt}\n"
+                    parts.append(f"  \\item \\textbf{{{escaped_key}}}: {escaped_value}\n")
+                parts.append("\\end{itemize}\n")
+                parts.append("\\vspace{-8pt}\n")
         
-        return section_latex
+        return "".join(parts)
     
     @staticmethod
     def _render_structured_list(section_name: str, items: List[Dict[str, Any]]) -> str:
@@ -198,11 +488,11 @@ class LaTeXService:
         first_item = items[0]
         keys = set(first_item.keys())
         
-        result = ""
+        parts = []
         
         # Education/Experience-like structure (has institution/company, position/degree, location, date)
         if ("institution" in keys or "company" in keys) and "location" in keys and "date" in keys:
-            result += "  \\resumeSubHeadingListStart\n"
+            parts.append("  \\resumeSubHeadingListStart\n")
             for item in items:
                 # Determine if it's education or experience-like
                 title1 = LaTeXService._escape_latex(item.get("institution") or item.get("company", ""))
@@ -210,24 +500,24 @@ class LaTeXService:
                 subtitle1 = LaTeXService._escape_latex(item.get("degree") or item.get("position", ""))
                 subtitle2 = LaTeXService._escape_latex(item.get("date", ""))
                 
-                result += f"    \\resumeSubheading\n"
-                result += f"      {{{title1}}}{{{title2}}}\n"
-                result += f"      {{{subtitle1}}}{{{subtitle2}}}\n"
+                parts.append(f"    \\resumeSubheading\n")
+                parts.append(f"      {{{title1}}}{{{title2}}}\n")
+                parts.append(f"      {{{subtitle1}}}{{{subtitle2}}}\n")
                 
                 # Add details/responsibilities if present
                 details = item.get("details") or item.get("responsibilities") or item.get("description", [])
                 if details and isinstance(details, list):
-                    result += "      \\resumeItemListStart\n"
+                    parts.append("      \\resumeItemListStart\n")
                     for detail in details:
                         escaped_detail = LaTeXService._escape_latex(str(detail))
-                        result += f"        \\resumeItem{{{escaped_detail}}}\n"
-                    result += "      \\resumeItemListEnd\n"
-            result += "  \\resumeSubHeadingListEnd\n"
-            result += "\\vspace{-16pt}\n"
+                        parts.append(f"        \\resumeItem{{{escaped_detail}}}\n")
+                    parts.append("      \\resumeItemListEnd\n")
+            parts.append("  \\resumeSubHeadingListEnd\n")
+            parts.append("\\vspace{-16pt}\n")
         
         # Project-like structure (has name, technologies, description)
         elif "name" in keys and ("technologies" in keys or "description" in keys):
-            result += "    \\resumeSubHeadingListStart\n"
+            parts.append("    \\resumeSubHeadingListStart\n")
             for idx, item in enumerate(items):
                 name = LaTeXService._escape_latex(item.get("name", ""))
                 technologies = item.get("technologies", [])
@@ -240,34 +530,34 @@ class LaTeXService:
                 else:
                     project_title = f"\\textbf{{{name}}}" + (f" $|$ \\emph{{{tech_string}}}" if tech_string else "")
                 
-                result += f"      \\resumeProjectHeading\n"
-                result += f"          {{{project_title}}}{{{date}}}\n"
+                parts.append(f"      \\resumeProjectHeading\n")
+                parts.append(f"          {{{project_title}}}{{{date}}}\n")
                 
                 # Add description
                 description = item.get("description", [])
                 if description:
                     if isinstance(description, list):
-                        result += "          \\resumeItemListStart\n"
+                        parts.append("          \\resumeItemListStart\n")
                         for desc in description:
                             escaped_desc = LaTeXService._escape_latex(str(desc))
-                            result += f"            \\resumeItem{{{escaped_desc}}}\n"
-                        result += "          \\resumeItemListEnd\n"
+                            parts.append(f"            \\resumeItem{{{escaped_desc}}}\n")
+                        parts.append("          \\resumeItemListEnd\n")
                     elif isinstance(description, str):
-                        result += "          \\resumeItemListStart\n"
+                        parts.append("          \\resumeItemListStart\n")
                         escaped_desc = LaTeXService._escape_latex(description)
-                        result += f"            \\resumeItem{{{escaped_desc}}}\n"
-                        result += "          \\resumeItemListEnd\n"
+                        parts.append(f"            \\resumeItem{{{escaped_desc}}}\n")
+                        parts.append("          \\resumeItemListEnd\n")
                 
                 # Add spacing AFTER the entire project entry (between projects only)
                 if idx < len(items) - 1:
-                    result += "      \\vspace{-16pt}\n"
+                    parts.append("      \\vspace{-16pt}\n")
             
-            result += "    \\resumeSubHeadingListEnd\n"
+            parts.append("    \\resumeSubHeadingListEnd\n")
         
         # Certification-like structure (has name, issuer, date)
         elif "name" in keys and "issuer" in keys:
-            result += " \\begin{itemize}[leftmargin=0.15in, label={}]\n"
-            result += "    \\small{\\item{\n"
+            parts.append(" \\begin{itemize}[leftmargin=0.15in, label={}]\n")
+            parts.append("    \\small{\\item{\n")
             for item in items:
                 name = LaTeXService._escape_latex(item.get("name", ""))
                 issuer = LaTeXService._escape_latex(item.get("issuer", ""))
@@ -275,58 +565,58 @@ class LaTeXService:
                 url = item.get("url", "")
                 
                 if url and url.strip():
-                    result += f"     \\textbf{{\\href{{{url}}}{{{name}}}}} - {issuer} ({date}) \\\\\n"
+                    parts.append(f"     \\textbf{{\\href{{{url}}}{{{name}}}}} - {issuer} ({date}) \\\\\n")
                 else:
-                    result += f"     \\textbf{{{name}}} - {issuer} ({date}) \\\\\n"
-            result += "    }}\n"
-            result += " \\end{itemize}\n"
-            result += " \\vspace{-16pt}\n"
+                    parts.append(f"     \\textbf{{{name}}} - {issuer} ({date}) \\\\\n")
+            parts.append("    }}\n")
+            parts.append(" \\end{itemize}\n")
+            parts.append(" \\vspace{-16pt}\n")
         
         # Leadership/Organization-like structure (has organization/role)
         elif ("organization" in keys or "role" in keys) and "date" in keys:
-            result += "    \\resumeSubHeadingListStart\n"
+            parts.append("    \\resumeSubHeadingListStart\n")
             for item in items:
                 org = LaTeXService._escape_latex(item.get("organization", ""))
                 role = LaTeXService._escape_latex(item.get("role", ""))
                 date = LaTeXService._escape_latex(item.get("date", ""))
                 
-                result += f"      \\resumeSubheading\n"
-                result += f"        {{{org}}}{{}}\n"
-                result += f"        {{{role}}}{{{date}}}\n"
+                parts.append(f"      \\resumeSubheading\n")
+                parts.append(f"        {{{org}}}{{}}\n")
+                parts.append(f"        {{{role}}}{{{date}}}\n")
                 
                 # Add description
                 description = item.get("description", [])
                 if description and isinstance(description, list):
-                    result += "        \\resumeItemListStart\n"
+                    parts.append("        \\resumeItemListStart\n")
                     for desc in description:
                         escaped_desc = LaTeXService._escape_latex(str(desc))
-                        result += f"          \\resumeItem{{{escaped_desc}}}\n"
-                    result += "        \\resumeItemListEnd\n"
-            result += "    \\resumeSubHeadingListEnd\n"
+                        parts.append(f"          \\resumeItem{{{escaped_desc}}}\n")
+                    parts.append("        \\resumeItemListEnd\n")
+            parts.append("    \\resumeSubHeadingListEnd\n")
         
         # Generic structured list - render as simple items
         else:
-            result += "\\begin{itemize}[leftmargin=0.15in]\n"
+            parts.append("\\begin{itemize}[leftmargin=0.15in]\n")
             for item in items:
                 # Try to create a meaningful representation
                 if "name" in item:
                     name = LaTeXService._escape_latex(str(item.get("name", "")))
-                    result += f"  \\item \\textbf{{{name}}}"
+                    parts.append(f"  \\item \\textbf{{{name}}}")
                     # Add other fields
                     for key, value in item.items():
                         if key != "name" and value:
                             escaped_value = LaTeXService._escape_latex(str(value))
-                            result += f" - {escaped_value}"
-                    result += "\n"
+                            parts.append(f" - {escaped_value}")
+                    parts.append("\n")
                 else:
                     # Just list all key-value pairs
                     item_text = ", ".join([f"{k}: {v}" for k, v in item.items() if v])
                     escaped_text = LaTeXService._escape_latex(item_text)
-                    result += f"  \\item {escaped_text}\n"
-            result += "\\end{itemize}\n"
-            result += "\\vspace{-8pt}\n"
+                    parts.append(f"  \\item {escaped_text}\n")
+            parts.append("\\end{itemize}\n")
+            parts.append("\\vspace{-8pt}\n")
         
-        return result
+        return "".join(parts)
     
     @staticmethod
     def _preprocess_template(template_content: str) -> str:
@@ -374,11 +664,39 @@ class LaTeXService:
         return result
     
     @staticmethod
-    def _map_json_to_template_vars(data: Dict[str, Any]) -> Dict[str, str]:
+    def _map_json_to_template_vars(data: Dict[str, Any], scope: Tuple[Any, ...] = ()) -> Dict[str, str]:
         """
         Map JSON resume data to LaTeX template variables.
         Converts structured JSON into flat template variable mappings.
+        Section variables come from the section cache when their data is unchanged.
         """
+        vars_dict = LaTeXService._map_heading_to_template_vars(data)
+        
+        # Predefined sections: template variable, data key, builder, render even when empty
+        sections = [
+            ("EDUCATION_SECTION", "education", LaTeXService._build_education_section, True),
+            ("EXPERIENCE_SECTION", "experience", LaTeXService._build_experience_section, True),
+            ("PROJECTS_SECTION", "projects", LaTeXService._build_projects_section, True),
+            ("SKILLS_SECTION", "skills", LaTeXService._build_skills_section, True),
+            # Optional sections
+            ("CERTIFICATIONS_SECTION", "certifications", LaTeXService._build_certifications_section, False),
+            ("LEADERSHIP_SECTION", "leadership", LaTeXService._build_leadership_section, False),
+        ]
+        for var_name, key, builder, render_empty in sections:
+            if key in data and (render_empty or data[key]):
+                section_data = data[key]
+                vars_dict[var_name] = section_cache.get_or_render(
+                    section_cache.make_key(scope, key, section_data),
+                    lambda builder=builder, section_data=section_data: builder(section_data)
+                )
+            else:
+                vars_dict[var_name] = ""
+        
+        return vars_dict
+    
+    @staticmethod
+    def _map_heading_to_template_vars(data: Dict[str, Any]) -> Dict[str, str]:
+        """Map the heading block to its template variables (empty dict when there is no heading)."""
         vars_dict = {}
         
         # HEADING SECTION
@@ -406,111 +724,69 @@ class LaTeXService:
                 vars_dict["GITHUB_USERNAME"] = ""
             
             # Additional links
-            additional_links = ""
+            additional_links = []
             if "additional_links" in heading and heading["additional_links"]:
                 for link in heading["additional_links"]:
                     icon = link.get("icon", "faLink")
                     url = link.get("url", "")
                     display_text = link.get("display_text", url)
-                    additional_links += f"~\n    \\href{{{url}}}{{\\raisebox{{-0.2\\height}}\\{icon}\\ \\underline{{{display_text}}}}}"
-            vars_dict["ADDITIONAL_LINKS"] = additional_links
-        
-        # EDUCATION SECTION
-        if "education" in data:
-            education_section = LaTeXService._build_education_section(data["education"])
-            vars_dict["EDUCATION_SECTION"] = education_section
-        else:
-            vars_dict["EDUCATION_SECTION"] = ""
-        
-        # EXPERIENCE SECTION
-        if "experience" in data:
-            experience_section = LaTeXService._build_experience_section(data["experience"])
-            vars_dict["EXPERIENCE_SECTION"] = experience_section
-        else:
-            vars_dict["EXPERIENCE_SECTION"] = ""
-        
-        # PROJECTS SECTION
-        if "projects" in data:
-            projects_section = LaTeXService._build_projects_section(data["projects"])
-            vars_dict["PROJECTS_SECTION"] = projects_section
-        else:
-            vars_dict["PROJECTS_SECTION"] = ""
-        
-        # SKILLS SECTION
-        if "skills" in data:
-            skills_section = LaTeXService._build_skills_section(data["skills"])
-            vars_dict["SKILLS_SECTION"] = skills_section
-        else:
-            vars_dict["SKILLS_SECTION"] = ""
-        
-        # CERTIFICATIONS SECTION (Optional)
-        if "certifications" in data and data["certifications"]:
-            certifications_section = LaTeXService._build_certifications_section(data["certifications"])
-            vars_dict["CERTIFICATIONS_SECTION"] = certifications_section
-        else:
-            vars_dict["CERTIFICATIONS_SECTION"] = ""
-        
-        # LEADERSHIP SECTION (Optional)
-        if "leadership" in data and data["leadership"]:
-            leadership_section = LaTeXService._build_leadership_section(data["leadership"])
-            vars_dict["LEADERSHIP_SECTION"] = leadership_section
-        else:
-            vars_dict["LEADERSHIP_SECTION"] = ""
+                    additional_links.append(f"~\n    \\href{{{url}}}{{\\raisebox{{-0.2\\height}}\\{icon}\\ \\underline{{{display_text}}}}}")
+            vars_dict["ADDITIONAL_LINKS"] = "".join(additional_links)
         
         return vars_dict
     
     @staticmethod
     def _build_education_section(education_list: List[Dict[str, Any]]) -> str:
         """Build education section using \\resumeSubheading command."""
-        section = ""
+        parts = []
         for edu in education_list:
             institution = LaTeXService._escape_latex(edu.get("institution", ""))
             location = LaTeXService._escape_latex(edu.get("location", ""))
             degree = LaTeXService._escape_latex(edu.get("degree", ""))
             date = LaTeXService._escape_latex(edu.get("date", ""))
             
-            section += f"    \\resumeSubheading\n"
-            section += f"      {{{institution}}}{{{location}}}\n"
-            section += f"      {{{degree}}}{{{date}}}\n"
+            parts.append(f"    \\resumeSubheading\n")
+            parts.append(f"      {{{institution}}}{{{location}}}\n")
+            parts.append(f"      {{{degree}}}{{{date}}}\n")
             
             # Add details if present
             if "details" in edu and edu["details"]:
-                section += "      \\resumeItemListStart\n"
+                parts.append("      \\resumeItemListStart\n")
                 for detail in edu["details"]:
                     escaped_detail = LaTeXService._escape_latex(detail)
-                    section += f"        \\resumeItem{{{escaped_detail}}}\n"
-                section += "      \\resumeItemListEnd\n"
+                    parts.append(f"        \\resumeItem{{{escaped_detail}}}\n")
+                parts.append("      \\resumeItemListEnd\n")
         
-        return section
+        return "".join(parts)
     
     @staticmethod
     def _build_experience_section(experience_list: List[Dict[str, Any]]) -> str:
         """Build experience section using \\resumeSubheading command."""
-        section = ""
+        parts = []
         for exp in experience_list:
             company = LaTeXService._escape_latex(exp.get("company", ""))
             location = LaTeXService._escape_latex(exp.get("location", ""))
             position = LaTeXService._escape_latex(exp.get("position", ""))
             date = LaTeXService._escape_latex(exp.get("date", ""))
             
-            section += f"    \\resumeSubheading\n"
-            section += f"      {{{company}}}{{{location}}}\n"
-            section += f"      {{{position}}}{{{date}}}\n"
+            parts.append(f"    \\resumeSubheading\n")
+            parts.append(f"      {{{company}}}{{{location}}}\n")
+            parts.append(f"      {{{position}}}{{{date}}}\n")
             
             # Add responsibilities
             if "responsibilities" in exp and exp["responsibilities"]:
-                section += "      \\resumeItemListStart\n"
+                parts.append("      \\resumeItemListStart\n")
                 for resp in exp["responsibilities"]:
                     escaped_resp = LaTeXService._escape_latex(resp)
-                    section += f"        \\resumeItem{{{escaped_resp}}}\n"
-                section += "      \\resumeItemListEnd\n"
+                    parts.append(f"        \\resumeItem{{{escaped_resp}}}\n")
+                parts.append("      \\resumeItemListEnd\n")
         
-        return section
+        return "".join(parts)
     
     @staticmethod
     def _build_projects_section(projects_list: List[Dict[str, Any]]) -> str:
         """Build projects section using \\resumeProjectHeading command."""
-        section = ""
+        parts = []
         for proj in projects_list:
             name = LaTeXService._escape_latex(proj.get("name", ""))
             technologies = proj.get("technologies", [])
@@ -525,21 +801,21 @@ class LaTeXService:
             else:
                 project_title = f"\\textbf{{{name}}} $|$ \\emph{{{tech_string}}}"
             
-            section += f"      \\resumeProjectHeading\n"
-            section += f"          {{{project_title}}}{{{date}}}\n"
+            parts.append(f"      \\resumeProjectHeading\n")
+            parts.append(f"          {{{project_title}}}{{{date}}}\n")
             
             # Add description points
             if "description" in proj and proj["description"]:
-                section += "          \\resumeItemListStart\n"
+                parts.append("          \\resumeItemListStart\n")
                 for desc in proj["description"]:
                     escaped_desc = LaTeXService._escape_latex(desc)
-                    section += f"            \\resumeItem{{{escaped_desc}}}\n"
-                section += "          \\resumeItemListEnd\n"
+                    parts.append(f"            \\resumeItem{{{escaped_desc}}}\n")
+                parts.append("          \\resumeItemListEnd\n")
             
             # Add consistent vertical spacing between project items (not after last one)
             # This will be handled by the template's end section spacing
         
-        return section
+        return "".join(parts)
     
     @staticmethod
     def _build_skills_section(skills_data: Dict[str, Any]) -> str:
@@ -561,9 +837,9 @@ class LaTeXService:
         if not certifications_list:
             return ""
         
-        section = "\\section{Certifications}\n"
-        section += " \\begin{itemize}[leftmargin=0.15in, label={}]\n"
-        section += "    \\small{\\item{\n"
+        parts = ["\\section{Certifications}\n"]
+        parts.append(" \\begin{itemize}[leftmargin=0.15in, label={}]\n")
+        parts.append("    \\small{\\item{\n")
         
         for cert in certifications_list:
             name = cert.get("name", "")
@@ -572,15 +848,15 @@ class LaTeXService:
             url = cert.get("url", "")
             
             if url:
-                section += f"     \\textbf{{\\href{{{url}}}{{{name}}}}} - {issuer} ({date}) \\\\\n"
+                parts.append(f"     \\textbf{{\\href{{{url}}}{{{name}}}}} - {issuer} ({date}) \\\\\n")
             else:
-                section += f"     \\textbf{{{name}}} - {issuer} ({date}) \\\\\n"
+                parts.append(f"     \\textbf{{{name}}} - {issuer} ({date}) \\\\\n")
         
-        section += "    }}\n"
-        section += " \\end{itemize}\n"
-        section += " \\vspace{-16pt}\n"
+        parts.append("    }}\n")
+        parts.append(" \\end{itemize}\n")
+        parts.append(" \\vspace{-16pt}\n")
         
-        return section
+        return "".join(parts)
     
     @staticmethod
     def _build_leadership_section(leadership_list: List[Dict[str, Any]]) -> str:
@@ -588,36 +864,40 @@ class LaTeXService:
         if not leadership_list:
             return ""
         
-        section = "\\section{Leadership / Extracurricular}\n"
-        section += "    \\resumeSubHeadingListStart\n"
+        parts = ["\\section{Leadership / Extracurricular}\n"]
+        parts.append("    \\resumeSubHeadingListStart\n")
         
         for lead in leadership_list:
             organization = lead.get("organization", "")
             role = lead.get("role", "")
             date = lead.get("date", "")
             
-            section += f"      \\resumeSubheading\n"
-            section += f"        {{{organization}}}{{}}\n"
-            section += f"        {{{role}}}{{{date}}}\n"
+            parts.append(f"      \\resumeSubheading\n")
+            parts.append(f"        {{{organization}}}{{}}\n")
+            parts.append(f"        {{{role}}}{{{date}}}\n")
             
             if "description" in lead and lead["description"]:
-                section += "        \\resumeItemListStart\n"
+                parts.append("        \\resumeItemListStart\n")
                 for desc in lead["description"]:
-                    section += f"          \\resumeItem{{{desc}}}\n"
-                section += "        \\resumeItemListEnd\n"
+                    parts.append(f"          \\resumeItem{{{desc}}}\n")
+                parts.append("        \\resumeItemListEnd\n")
         
-        section += "    \\resumeSubHeadingListEnd\n"
+        parts.append("    \\resumeSubHeadingListEnd\n")
         
-        return section
+        return "".join(parts)
 
     @staticmethod
-    def generate_pdf(latex_content: str, output_path: str, use_online: bool = True) -> tuple[bool, str]:
+    def generate_pdf(
+        latex_content: str, output_path: str, use_online: bool = True, timeout: Optional[float] = None
+    ) -> tuple[bool, str]:
         """
         Generate PDF from LaTeX content.
         Args:
             latex_content: The LaTeX source code
             output_path: Where to save the PDF
             use_online: If True, try online compilation first (no LaTeX installation needed)
+            timeout: Seconds allowed for the whole job, shared by every compile attempt
+                (None = 45 s per online service, no limit for local pdflatex)
         Returns:
             tuple of (success: bool, message: str)
         """
@@ -626,10 +906,13 @@ class LaTeXService:
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
+        # One deadline for the job: each fallback only gets the time that is left
+        deadline = time.monotonic() + timeout if timeout else None
+        
         # Try online compilation first if enabled
         if use_online:
             print("Attempting online LaTeX compilation...")
-            success, message = LaTeXService._compile_online(latex_content, output_path)
+            success, message = LaTeXService._compile_online(latex_content, output_path, timeout=timeout or 45)
             if success:
                 print(f"Online compilation succeeded: {message}")
                 return True, message
@@ -638,9 +921,11 @@ class LaTeXService:
                 # Continue to try local compilation as fallback
         
         # Try local pdflatex as fallback
+        if _time_left(deadline) == 0:
+            return False, f"PDF compilation timed out after {timeout} seconds"
         if LaTeXService._is_pdflatex_available():
             print("Attempting local pdflatex compilation...")
-            return LaTeXService._compile_local(latex_content, output_path)
+            return LaTeXService._compile_local(latex_content, output_path, timeout=_time_left(deadline))
         
         # Both online and local failed - save tex file
         tex_path = output_path.replace('.pdf', '.tex')
@@ -652,18 +937,22 @@ class LaTeXService:
             return False, f"Failed to save LaTeX file: {str(e)}"
     
     @staticmethod
-    def _compile_online(latex_content: str, output_path: str) -> tuple[bool, str]:
+    def _compile_online(latex_content: str, output_path: str, timeout: float = 45) -> tuple[bool, str]:
         """
         Compile LaTeX using online service.
         No local LaTeX installation required!
+        timeout is shared by both services, so the alternative only gets what
+        LaTeX.Online left over.
         """
+        deadline = time.monotonic() + timeout
+        
         # Service 1: LaTeX.Online (primary)
         try:
             print("Trying LaTeX.Online service...")
             url = "https://latexonline.cc/compile"
             files = {'file': ('resume.tex', latex_content.encode('utf-8'), 'text/plain')}
             
-            response = requests.post(url, files=files, timeout=45)
+            response = requests.post(url, files=files, timeout=timeout)
             print(f"LaTeX.Online response: Status={response.status_code}, Content-Length={len(response.content)}")
             
             if response.status_code == 200 and len(response.content) > 1000:  # Valid PDF
@@ -679,6 +968,8 @@ class LaTeXService:
             print(f"LaTeX.Online error: {str(e)}")
         
         # Service 2: Alternative - Direct HTTP compile
+        if _time_left(deadline) == 0:
+            return False, f"Online compilation timed out after {timeout} seconds"
         try:
             print("Trying alternative online service...")
             url = "https://texlive.net/cgi-bin/latexcgi"
@@ -687,7 +978,7 @@ class LaTeXService:
                 'filename': 'resume.tex',
                 'engine': 'pdflatex'
             }
-            response = requests.post(url, data=data, timeout=45)
+            response = requests.post(url, data=data, timeout=_time_left(deadline))
             print(f"Alternative service response: Status={response.status_code}")
             
             if response.status_code == 200 and len(response.content) > 1000:
@@ -701,43 +992,63 @@ class LaTeXService:
         return False, "All online compilation services failed. The LaTeX syntax may have errors, or the services are unavailable."
     
     @staticmethod
-    def _compile_local(latex_content: str, output_path: str) -> tuple[bool, str]:
-        """Compile LaTeX using local pdflatex installation."""
-        temp_tex = "temp_resume.tex"
+    def _compile_local(latex_content: str, output_path: str, timeout: Optional[float] = None) -> tuple[bool, str]:
+        """
+        Compile LaTeX using local pdflatex installation.
+        Each compile runs in its own scratch directory under a unique job name,
+        so concurrent compiles never touch each other's files.
+        timeout covers the format build and every pdflatex run together.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        job_name = f"resume_{uuid.uuid4().hex}"
         try:
-            with open(temp_tex, "w", encoding="utf-8") as f:
-                f.write(latex_content)
-            
-            # Run pdflatex twice for proper rendering
-            result = subprocess.run(
-                ["pdflatex", "-interaction=nonstopmode", temp_tex],
-                check=True,
-                cwd=os.getcwd(),
-                capture_output=True,
-                text=True
-            )
-            
-            # Check if PDF was created
-            temp_pdf = "temp_resume.pdf"
-            if os.path.exists(temp_pdf):
-                os.rename(temp_pdf, output_path)
-                # Clean up auxiliary files
-                for ext in [".aux", ".log", ".tex", ".out"]:
-                    temp_file = f"temp_resume{ext}"
-                    if os.path.exists(temp_file):
-                        os.remove(temp_file)
+            # The scratch directory (and every auxiliary file) is removed on exit
+            with tempfile.TemporaryDirectory(prefix="latex_") as work_dir:
+                with open(os.path.join(work_dir, f"{job_name}.tex"), "w", encoding="utf-8") as f:
+                    f.write(latex_content)
+                
+                command = ["pdflatex", "-interaction=nonstopmode", f"-jobname={job_name}", f"{job_name}.tex"]
+                pdf_path = os.path.join(work_dir, f"{job_name}.pdf")
+                
+                # Warm path: load the template's precompiled preamble format
+                # instead of re-parsing every package on each compile
+                format_path = None
+                if settings.latex_precompile_preamble:
+                    format_path = _preamble_formats.get(latex_content, _time_left(deadline))
+                if format_path:
+                    format_name = os.path.splitext(os.path.basename(format_path))[0]
+                    _link_or_copy(format_path, os.path.join(work_dir, f"{format_name}.fmt"))
+                    warm = subprocess.run(
+                        [command[0], f"-fmt={format_name}"] + command[1:],
+                        cwd=work_dir,
+                        capture_output=True,
+                        text=True,
+                        timeout=_time_left(deadline)
+                    )
+                    if warm.returncode != 0 and os.path.exists(pdf_path):
+                        os.remove(pdf_path)
+                
+                # Cold path: full compile (also the fallback if the warm compile failed)
+                if not os.path.exists(pdf_path):
+                    subprocess.run(
+                        command,
+                        check=True,
+                        cwd=work_dir,
+                        capture_output=True,
+                        text=True,
+                        timeout=_time_left(deadline)
+                    )
+                
+                # Check if PDF was created
+                if not os.path.exists(pdf_path):
+                    return False, "PDF file was not created"
+                shutil.move(pdf_path, output_path)
                 return True, "PDF generated successfully using local pdflatex"
-            else:
-                return False, "PDF file was not created"
                 
         except subprocess.CalledProcessError as e:
-            error_msg = f"pdflatex compilation failed: {e.stderr if e.stderr else str(e)}"
-            # Clean up on failure
-            for ext in [".aux", ".log", ".tex", ".out", ".pdf"]:
-                temp_file = f"temp_resume{ext}"
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            return False, error_msg
+            return False, f"pdflatex compilation failed: {e.stderr if e.stderr else str(e)}"
+        except subprocess.TimeoutExpired:
+            return False, f"pdflatex compilation timed out after {timeout:.1f} seconds"
         except FileNotFoundError:
             return False, "pdflatex command not found. Please install TeX Live or MiKTeX."
         except Exception as e:
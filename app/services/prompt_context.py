@@ -0,0 +1,196 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sections kept longest when a resume has to be trimmed to fit the budget, most important first.
+# Sections not listed here rank below all of them, in their original order.
+SECTION_PRIORITY = ["experience", "skills", "projects", "education", "certifications", "leadership"]
+
+# Keys that never help the model: links, icon names, layout and identifiers
+_SKIPPED_KEYS = {"section_order", "url", "icon", "credential_id", "linkedin", "github", "additional_links", "address"}
+
+# Keys rendered as an entry's bullet points rather than its header line
+_BULLET_KEYS = ("responsibilities", "description", "details")
+
+Entry = Tuple[str, List[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for LLM prompts (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+class ResumePromptContext:
+    """Compact text form of a resume for prompts, with before/after token estimates."""
+
+    def __init__(self, text: str, tokens_before: int, tokens_after: int, trimmed: bool):
+        self.text = text
+        self.tokens_before = tokens_before
+        self.tokens_after = tokens_after
+        self.trimmed = trimmed
+
+    def __str__(self) -> str:
+        return self.text
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "trimmed": self.trimmed,
+        }
+
+
+def build_resume_context(content_json: Dict[str, Any], token_budget: Optional[int] = None) -> ResumePromptContext:
+    """
+    Serialize resume content_json into compact, deduplicated text.
+
+    Links, icons, section_order and empty values are dropped. When the result
+    exceeds token_budget, bullets, then entries, then whole sections are
+    removed starting from the lowest priority section (see SECTION_PRIORITY).
+    tokens_before is measured on the raw dict form previously sent in prompts.
+    """
+    tokens_before = estimate_tokens(str(content_json))
+
+    header = _heading_line(content_json.get("heading"))
+    seen: set = set()
+    sections = []
+    for name in _ordered_section_names(content_json):
+        entries = _section_entries(content_json[name], seen)
+        if entries:
+            sections.append([name, entries])
+
+    text = _render(header, sections)
+    trimmed = False
+    if token_budget is not None and estimate_tokens(text) > token_budget:
+        # Track the length as pieces are removed instead of re-rendering every step
+        length = len(text)
+        while length > token_budget * 4:
+            removed = _trim_once(sections)
+            if not removed:
+                break
+            length -= removed
+        trimmed = True
+        text = _render(header, sections)
+        if estimate_tokens(text) > token_budget:
+            # A single entry still does not fit: cut the text itself
+            text = text[:token_budget * 4].rstrip()
+
+    return ResumePromptContext(text, tokens_before, estimate_tokens(text), trimmed)
+
+
+def _ordered_section_names(content_json: Dict[str, Any]) -> List[str]:
+    names = [name for name in content_json if name != "heading" and name not in _SKIPPED_KEYS]
+    ranked = [name for name in SECTION_PRIORITY if name in names]
+    return ranked + [name for name in names if name not in SECTION_PRIORITY]
+
+
+def _heading_line(heading: Any) -> str:
+    if not isinstance(heading, dict):
+        return ""
+    parts = [str(heading.get(key)).strip() for key in ("full_name", "email", "phone") if heading.get(key)]
+    return " | ".join(parts)
+
+
+def _section_entries(section_data: Any, seen: set) -> List[Entry]:
+    """Turn one section into (header, bullets) entries, skipping text already seen."""
+    if isinstance(section_data, dict):
+        if "categories" in section_data:
+            # Skills: one entry per category, each item listed once across the resume
+            entries = []
+            for category in section_data["categories"]:
+                items = _unique([str(item) for item in category.get("items", [])], seen)
+                if items:
+                    entries.append((f"{category.get('name', '')}: {', '.join(items)}".strip(": "), []))
+            return entries
+        section_data = [section_data]
+
+    if isinstance(section_data, str):
+        section_data = [section_data]
+    if not isinstance(section_data, list):
+        return []
+
+    entries = []
+    for item in section_data:
+        if isinstance(item, dict):
+            entry = _item_entry(item, seen)
+        else:
+            lines = _unique([str(item)], seen)
+            entry = (lines[0], []) if lines else None
+        if entry:
+            entries.append(entry)
+    return entries
+
+
+def _item_entry(item: Dict[str, Any], seen: set) -> Optional[Entry]:
+    fields = []
+    bullets: List[str] = []
+    for key, value in item.items():
+        if key in _SKIPPED_KEYS or value in (None, "", [], {}):
+            continue
+        if key in _BULLET_KEYS:
+            values = value if isinstance(value, list) else [value]
+            bullets.extend(str(v) for v in values if v)
+        elif isinstance(value, list):
+            fields.append(f"[{', '.join(str(v) for v in value if v)}]")
+        elif isinstance(value, dict):
+            fields.append(", ".join(f"{k}: {v}" for k, v in value.items() if v))
+        else:
+            fields.append(str(value).strip())
+    bullets = _unique(bullets, seen)
+    if not fields and not bullets:
+        return None
+    return " | ".join(field for field in fields if field), bullets
+
+
+def _unique(values: List[str], seen: set) -> List[str]:
+    """Drop blanks and anything already emitted elsewhere in the resume (case-insensitive)."""
+    unique = []
+    for value in values:
+        value = " ".join(value.split())
+        normalized = value.lower()
+        if value and normalized not in seen:
+            seen.add(normalized)
+            unique.append(value)
+    return unique
+
+
+def _render(header: str, sections: List[list]) -> str:
+    lines = [header] if header else []
+    for name, entries in sections:
+        lines.append(_section_line(name))
+        for entry_header, bullets in entries:
+            lines.append(_entry_line(entry_header))
+            lines.extend(_bullet_line(bullet) for bullet in bullets)
+    return "\n".join(lines)
+
+
+def _section_line(name: str) -> str:
+    return f"## {name.replace('_', ' ').title()}"
+
+
+def _entry_line(entry_header: str) -> str:
+    return f"- {entry_header}" if entry_header else "-"
+
+
+def _bullet_line(bullet: str) -> str:
+    return f"  * {bullet}"
+
+
+def _entry_length(entry: Entry) -> int:
+    return len(_entry_line(entry[0])) + 1 + sum(len(_bullet_line(bullet)) + 1 for bullet in entry[1])
+
+
+def _trim_once(sections: List[list]) -> int:
+    """
+    Remove one piece from the lowest priority section that has something left to give.
+    Returns the number of rendered characters removed, 0 when nothing can go.
+    """
+    for index in range(len(sections) - 1, -1, -1):
+        name, entries = sections[index]
+        longest = max(entries, key=lambda entry: len(entry[1]))
+        if len(longest[1]) > 1:
+            return len(_bullet_line(longest[1].pop())) + 1
+        if len(entries) > 1:
+            return _entry_length(entries.pop())
+        if index > 0:
+            sections.pop(index)
+            return len(_section_line(name)) + 1 + _entry_length(entries[0])
+    return 0
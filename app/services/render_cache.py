@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+from app.core.config import settings
+
+# Eviction frees space down to this fraction of max_bytes, so the next
+# writes do not each trigger another eviction pass
+_EVICT_TO_FRACTION = 0.9
+
+
+class RenderCache:
+    """
+    Content-addressed on-disk cache for generated resume artifacts (.tex, .pdf).
+
+    Artifacts are stored as {key}.{ext}, where the key is a stable hash of the
+    canonicalized resume content, the template id/version and the renderer
+    version. Any change to one of those produces a new key, so entries never
+    need explicit invalidation. The directory is kept under max_bytes by
+    evicting the least recently used files.
+
+    Sizes and recency are tracked in memory (path -> size, in LRU order), so a
+    write costs O(1). The directory is only scanned on first use and when the
+    tracked total passes max_bytes, which also picks up files written by other
+    worker processes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, url_prefix: Optional[str] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.url_prefix = url_prefix or "/" + directory.strip("/").replace(os.sep, "/")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._indexed = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content_json: Dict[str, Any], template_id: Any, template_version: Any, renderer_version: str) -> str:
+        """Hash the canonical JSON form of everything that affects the output."""
+        canonical = json.dumps(
+            {
+                "content": content_json,
+                "template_id": template_id,
+                "template_version": template_version,
+                "renderer_version": renderer_version,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, ext: str) -> str:
+        return os.path.join(self.directory, f"{key}.{ext}")
+
+    def url_for(self, key: str, ext: str) -> str:
+        return f"{self.url_prefix}/{key}.{ext}"
+
+    def get(self, key: str, ext: str) -> Optional[str]:
+        """Return the artifact URL on a hit, or None on a miss."""
+        return self.lookup(key, ext)[ext]
+
+    def lookup(self, key: str, ext: str, *companions: str) -> Dict[str, Optional[str]]:
+        """
+        URL (or None) of the ext artifact and of each companion artifact built
+        from the same key. Counts as a single hit or miss, decided by ext alone.
+        """
+        urls = {e: self.url_for(key, e) if self._touch(self.path_for(key, e)) else None for e in (ext, *companions)}
+        with self._lock:
+            if urls[ext]:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return urls
+
+    def _touch(self, path: str) -> bool:
+        """Mark an artifact as recently used; False if it is gone."""
+        try:
+            # Touch the file so eviction sees it as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                # Removed behind our back (another process evicted it)
+                self._total_bytes -= self._sizes.pop(path, 0)
+            return False
+        with self._lock:
+            if path in self._sizes:
+                self._sizes.move_to_end(path)
+        return True
+
+    def put(self, key: str, ext: str, data: Union[str, bytes]) -> str:
+        """Store an artifact and return its URL."""
+        tmp_path = self.scratch_path(key, ext)
+        if isinstance(data, str):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+        else:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+        return self._commit(tmp_path, key, ext)
+
+    def scratch_path(self, key: str, ext: str) -> str:
+        """A unique hidden path inside the cache directory, ignored by eviction."""
+        os.makedirs(self.directory, exist_ok=True)
+        return self.path_for(f".{key}.{uuid.uuid4().hex}", ext)
+
+    def adopt(self, key: str, ext: str, src_path: str) -> str:
+        """Move an already written file (e.g. a compiled PDF) into the cache."""
+        if os.path.dirname(os.path.abspath(src_path)) != os.path.abspath(self.directory):
+            tmp_path = self.scratch_path(key, ext)
+            shutil.move(src_path, tmp_path)
+            src_path = tmp_path
+        return self._commit(src_path, key, ext)
+
+    def _commit(self, tmp_path: str, key: str, ext: str) -> str:
+        path = self.path_for(key, ext)
+        size = os.path.getsize(tmp_path)
+        # Atomic rename: concurrent readers never see a partially written file
+        os.replace(tmp_path, path)
+        with self._lock:
+            if not self._indexed:
+                self._scan()
+            self._total_bytes += size - self._sizes.pop(path, 0)
+            self._sizes[path] = size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+        return self.url_for(key, ext)
+
+    def _scan(self) -> None:
+        """Rebuild the in-memory index from the directory, oldest first. Caller holds the lock."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.is_file() or entry.name.startswith("."):
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        entries.sort()
+        self._sizes = OrderedDict((path, size) for _, size, path in entries)
+        self._total_bytes = sum(self._sizes.values())
+        self._indexed = True
+
+    def _evict(self) -> None:
+        """Remove least recently used artifacts until the cache is back under max_bytes. Caller holds the lock."""
+        # Rescan first: other processes may have written or evicted files
+        self._scan()
+        target = self.max_bytes * _EVICT_TO_FRACTION
+        while self._sizes and self._total_bytes > target:
+            path, size = self._sizes.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._sizes),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+render_cache = RenderCache(settings.render_cache_dir, settings.render_cache_max_bytes)
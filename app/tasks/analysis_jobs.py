@@ -0,0 +1,156 @@
+import asyncio
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, Optional, Set, Tuple
+from sqlalchemy import func, update
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.session import AsyncSessionLocal
+from app.modules.analysis.models import AnalysisStatus, ResumeAnalysis
+from app.services.ai_service import AIService
+
+# (resume_id, job_id, analysis_type)
+AnalysisKey = Tuple[uuid.UUID, Optional[uuid.UUID], str]
+
+
+async def _save_result(analysis_id: uuid.UUID, status: AnalysisStatus, feedback: Optional[Dict[str, Any]]) -> None:
+    """Write a finished analysis; uses its own short-lived session."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(ResumeAnalysis)
+            .where(ResumeAnalysis.id == analysis_id)
+            .values(status=status, feedback_json=feedback)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+class AnalysisJobs:
+    """
+    Runs resume analyses in the background on the event loop.
+
+    The request handler inserts a pending ResumeAnalysis row and returns; the
+    LLM call happens here without holding a DB session, and only the final
+    write opens one. While an analysis for the same (resume, job, type) is in
+    flight, new requests are pointed at its row instead of starting another.
+
+    A cancelled analysis (e.g. on shutdown) marks its row failed. Rows left
+    pending by a worker that died are marked failed by the periodic sweep once
+    they are older than settings.analysis_stale_after_seconds.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[AnalysisKey, uuid.UUID] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Metrics
+        self._submitted = 0
+        self._coalesced = 0
+        self._completed = 0
+        self._failed = 0
+        self._swept = 0
+
+    def in_flight(self, key: AnalysisKey) -> Optional[uuid.UUID]:
+        """Id of the pending analysis for key, if one is running."""
+        analysis_id = self._in_flight.get(key)
+        if analysis_id is not None:
+            self._coalesced += 1
+        return analysis_id
+
+    def submit(
+        self,
+        key: AnalysisKey,
+        analysis_id: uuid.UUID,
+        resume_content: dict,
+        job_desc: Optional[str],
+        use_cache: bool = True,
+        user_id: Any = None
+    ) -> None:
+        """Start the analysis for an already inserted pending row. Must be called from the event loop."""
+        self._submitted += 1
+        self._in_flight[key] = analysis_id
+        task = asyncio.create_task(self._run(key, analysis_id, resume_content, job_desc, use_cache, user_id))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self,
+        key: AnalysisKey,
+        analysis_id: uuid.UUID,
+        resume_content: dict,
+        job_desc: Optional[str],
+        use_cache: bool,
+        user_id: Any
+    ) -> None:
+        try:
+            try:
+                feedback = await AIService.analyze_resume(resume_content, job_desc, use_cache=use_cache, user_id=user_id)
+                status = AnalysisStatus.completed
+                self._completed += 1
+            except Exception as e:
+                logger.warning(f"Analysis {analysis_id} failed: {e}")
+                feedback = {"error": str(e)}
+                status = AnalysisStatus.failed
+                self._failed += 1
+            await _save_result(analysis_id, status, feedback)
+        except asyncio.CancelledError:
+            # Shutdown or cancelled task: the row must not stay pending forever
+            self._failed += 1
+            try:
+                await asyncio.shield(_save_result(analysis_id, AnalysisStatus.failed, {"error": "Analysis was cancelled"}))
+            except BaseException as e:
+                logger.error(f"Could not mark cancelled analysis {analysis_id} failed: {e!r}")
+            raise
+        except Exception as e:
+            logger.error(f"Could not save analysis {analysis_id}: {e}")
+        finally:
+            if self._in_flight.get(key) == analysis_id:
+                del self._in_flight[key]
+
+    async def fail_stale(self) -> int:
+        """Mark pending analyses older than settings.analysis_stale_after_seconds failed; returns how many."""
+        stale_before = func.now() - timedelta(seconds=settings.analysis_stale_after_seconds)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(ResumeAnalysis)
+                .where(
+                    ResumeAnalysis.status == AnalysisStatus.pending,
+                    ResumeAnalysis.created_at < stale_before,
+                    ResumeAnalysis.id.notin_(list(self._in_flight.values())),
+                )
+                .values(status=AnalysisStatus.failed, feedback_json={"error": "Analysis was interrupted"})
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if result.rowcount:
+            logger.warning(f"Marked {result.rowcount} stale pending analyses failed")
+        self._swept += result.rowcount
+        return result.rowcount
+
+    def start_sweeper(self) -> None:
+        """Run fail_stale now and then every settings.analysis_stale_after_seconds. Must be called from the event loop."""
+        task = asyncio.create_task(self._sweep())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _sweep(self) -> None:
+        while True:
+            try:
+                await self.fail_stale()
+            except Exception as e:
+                logger.error(f"Could not sweep stale analyses: {e}")
+            await asyncio.sleep(settings.analysis_stale_after_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._in_flight),
+            "submitted": self._submitted,
+            "coalesced": self._coalesced,
+            "completed": self._completed,
+            "failed": self._failed,
+            "swept": self._swept,
+        }
+
+
+analysis_jobs = AnalysisJobs()
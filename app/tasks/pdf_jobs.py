@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.services.compile_scheduler import compile_scheduler
+from app.services.jake_template_1_latex_service import LaTeXService
+from app.services.render_cache import render_cache
+
+
+def compile_pdf_artifact(cache_key: str, latex_content: str) -> tuple[bool, str, Optional[str]]:
+    """Compile LaTeX into the render cache. Runs on a compile scheduler worker."""
+    output_path = render_cache.scratch_path(cache_key, "pdf")
+    success, message = LaTeXService.generate_pdf(
+        latex_content,
+        output_path,
+        use_online=settings.latex_compile_online,
+        timeout=settings.pdf_compile_timeout_seconds
+    )
+    if not success:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        # generate_pdf saves the LaTeX source next to output_path when every
+        # compiler fails; the source is already in the render cache
+        fallback_tex = output_path.replace(".pdf", ".tex")
+        if os.path.exists(fallback_tex):
+            os.remove(fallback_tex)
+            message = "Both online and local compilation failed. The LaTeX source is still available at latex_url"
+        return False, message, None
+    return True, message, render_cache.adopt(cache_key, "pdf", output_path)
+
+
+class PdfJob:
+    """A PDF generation request tracked for status polling."""
+
+    def __init__(self, user_id: uuid.UUID, resume_id: uuid.UUID, latex_url: Optional[str]):
+        self.id = uuid.uuid4()
+        self.user_id = user_id
+        self.resume_id = resume_id
+        self.latex_url = latex_url
+        self.pdf_url: Optional[str] = None
+        self.message: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+
+    @property
+    def status(self) -> str:
+        if self.finished_at is not None:
+            return "completed" if self.pdf_url else "failed"
+        if self.future is not None and self.future.running():
+            return "running"
+        return "queued"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "resume_id": self.resume_id,
+            "status": self.status,
+            "message": self.message,
+            "latex_url": self.latex_url,
+            "pdf_url": self.pdf_url,
+        }
+
+
+class PdfJobStore:
+    """
+    In-process registry of PDF jobs.
+    Compiles run on the shared compile scheduler; finished jobs are kept for
+    ttl_seconds so clients can poll for the result.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[uuid.UUID, PdfJob] = {}
+        self._lock = threading.Lock()
+
+    def completed(self, user_id: uuid.UUID, resume_id: uuid.UUID, latex_url: Optional[str], pdf_url: str) -> PdfJob:
+        """Register a job whose PDF was already available (render cache hit)."""
+        job = PdfJob(user_id, resume_id, latex_url)
+        job.pdf_url = pdf_url
+        job.message = "PDF served from cache"
+        job.finished_at = job.created_at
+        self._add(job)
+        return job
+
+    def submit(self, user_id: uuid.UUID, resume_id: uuid.UUID, cache_key: str, latex_content: str, latex_url: str) -> PdfJob:
+        """
+        Queue a compile and return its job.
+        Raises CompileQueueFull when the compile scheduler cannot accept it.
+        """
+        job = PdfJob(user_id, resume_id, latex_url)
+        job.future = compile_scheduler.submit(cache_key, compile_pdf_artifact, cache_key, latex_content)
+        self._add(job)
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job
+
+    def get(self, job_id: uuid.UUID) -> Optional[PdfJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _add(self, job: PdfJob) -> None:
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+
+    def _finish(self, job: PdfJob, future: Future) -> None:
+        try:
+            success, message, pdf_url = future.result()
+            job.pdf_url = pdf_url if success else None
+            job.message = message
+        except Exception as e:
+            job.message = f"PDF compilation failed: {str(e)}"
+        job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+pdf_jobs = PdfJobStore(settings.pdf_job_ttl_seconds)
@@ -0,0 +1,94 @@
+"""
+Round-trip check for AIService.enhance_many, against a fake model.
+
+The real Gemini model is replaced by a fake whose generate_content_async
+sleeps for --delay seconds, so no API key or network is needed. For each
+--items count the check enhances that many bullets and fails unless:
+
+- bullets go settings.ai_enhance_batch_size per prompt, so a 20-bullet resume
+  is one batch call (plus one per-item call for the bullet its answer garbles)
+- batch calls overlap, up to settings.ai_enhance_concurrency at once and never more
+- the whole run takes about that many round-trips, not `items` of them
+- results keep the input order; a garbled item is enhanced on its own, and an
+  item whose own call fails too keeps its original text
+
+    python -m benchmarks.ai_concurrency_check
+    python -m benchmarks.ai_concurrency_check --items 20 400 --delay 0.2
+
+Exits with status 1 on any failure.
+"""
+import asyncio
+import json
+import math
+import time
+from typing import List
+from app.core.config import settings
+from app.services import ai_service
+from app.services.ai_gateway import AIGateway
+from app.services.ai_service import AIService
+from benchmarks.common import FakeModel, finish, make_parser
+
+# The batch answer garbles bullets containing this marker, and their own call is rejected
+FAILING_MARKER = "[fail]"
+
+
+def _echo_upper(prompt: str) -> str:
+    """Fake answer: every bullet upper-cased, in the batch JSON format or as plain text."""
+    if "Items: " in prompt:
+        items = json.loads(prompt.rsplit("Items: ", 1)[-1])
+        return json.dumps({"items": ["" if FAILING_MARKER in item["text"] else item["text"].upper() for item in items]})
+    if FAILING_MARKER in prompt:
+        raise ValueError("prompt rejected")
+    return prompt.rsplit(": ", 1)[-1].upper()
+
+
+async def run(items: int, delay: float) -> List[str]:
+    """Enhance items bullets through a gateway on the fake model. Returns the failures."""
+    # Rate limits are not under test here; keep them out of the way
+    settings.ai_rate_limit_burst = settings.ai_user_rate_limit_burst = items + 1
+    model = FakeModel(delay, _echo_upper)
+    ai_service.ai_gateway = AIGateway(model)
+
+    bullets = [f"bullet {index}" + (f" {FAILING_MARKER}" if index == 1 else "") for index in range(items)]
+    started_at = time.perf_counter()
+    results = await AIService.enhance_many([(bullet, "experience") for bullet in bullets], user_id="check")
+    elapsed = time.perf_counter() - started_at
+
+    batches = math.ceil(items / settings.ai_enhance_batch_size)
+    concurrency = min(settings.ai_enhance_concurrency, settings.ai_max_concurrent_calls, batches)
+    # The garbled bullet (the second one) costs one more call and, after its batch, one more round-trip
+    garbled = 1 if items > 1 else 0
+    expected_calls = batches + garbled
+    round_trips = math.ceil(batches / concurrency) + garbled
+    expected = round_trips * delay
+    print(f"{items} bullets, {delay:.2f}s per call: {model.calls} calls, {elapsed:.2f}s "
+          f"(expected {expected_calls} calls in {round_trips} round-trips, ~{expected:.2f}s; "
+          f"one call per bullet would be {items} calls), {model.max_in_flight} calls in flight at most")
+
+    failures = []
+    if model.calls != expected_calls:
+        failures.append(f"{items} bullets: expected {expected_calls} calls, saw {model.calls}")
+    if model.max_in_flight != concurrency:
+        failures.append(f"{items} bullets: expected {concurrency} calls in flight at most, saw {model.max_in_flight}")
+    if elapsed > expected * 1.5 + 0.1:
+        failures.append(f"{items} bullets took {elapsed:.2f}s, more than {round_trips} round-trips")
+    expected_results = [bullet if FAILING_MARKER in bullet else bullet.upper() for bullet in bullets]
+    if results != expected_results:
+        failures.append(f"{items} bullets: results are out of order or the failed item did not keep its original text")
+    return failures
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--items", type=int, nargs="+", default=[20, 400], help="Bullet counts to check")
+    parser.add_argument("--delay", type=float, default=0.2, help="Seconds each fake model call takes")
+    args = parser.parse_args()
+
+    failures = []
+    for items in args.items:
+        failures += asyncio.run(run(items, args.delay))
+    finish(failures, "ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Event-loop checks for AI calls, against a fake model.
+
+The real Gemini model is replaced by a fake whose generate_content_async
+sleeps for --delay seconds, so no API key or network is needed. While
+--calls slow AIService calls are awaiting the model, a ticker coroutine
+stands in for /health and every other request on the same event loop.
+The check fails unless:
+
+- the ticker keeps running on time: no gap between ticks much longer than
+  its interval, so a slow LLM call never stalls the loop
+- the slow calls overlap, taking about one call duration in total
+- a call that outlasts its timeout raises AITimeoutError after each retry
+  times out, without stalling the ticker, and leaves no call in flight
+
+    python -m benchmarks.ai_event_loop_check
+    python -m benchmarks.ai_event_loop_check --calls 8 --delay 2
+
+Exits with status 1 on any failure.
+"""
+import asyncio
+import time
+from typing import Awaitable, List, Tuple
+from app.core.config import settings
+from app.services import ai_service
+from app.services.ai_gateway import AIGateway, AITimeoutError
+from app.services.ai_service import AIService
+from benchmarks.common import FakeModel, finish, make_parser
+
+TICK_SECONDS = 0.01
+# Longest tolerated gap between ticks; a blocked loop shows up as a gap of a whole call
+MAX_TICK_GAP_SECONDS = 0.1
+
+
+async def _with_ticker(work: Awaitable) -> Tuple[object, List[float]]:
+    """Await work while a ticker runs alongside; returns work's result (or exception) and the tick gaps."""
+    gaps: List[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(TICK_SECONDS)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    ticking = asyncio.ensure_future(ticker())
+    try:
+        result = await work
+    except Exception as e:
+        result = e
+    finally:
+        done.set()
+        await ticking
+    return result, gaps
+
+
+def _ticker_failures(name: str, gaps: List[float], seconds: float) -> List[str]:
+    longest = max(gaps, default=0.0)
+    print(f"{name}: {len(gaps)} ticks in {seconds:.2f}s, longest gap {longest * 1000:.0f}ms")
+    if longest > MAX_TICK_GAP_SECONDS:
+        return [f"{name}: the event loop stalled for {longest:.2f}s while the AI call was awaiting"]
+    if not gaps:
+        return [f"{name}: the ticker never ran"]
+    return []
+
+
+async def check_slow_calls(calls: int, delay: float) -> List[str]:
+    settings.ai_cache_enabled = False
+    settings.ai_rate_limit_burst = settings.ai_user_rate_limit_burst = calls + 1
+    model = FakeModel(delay, lambda prompt: "analysis")
+    ai_service.ai_gateway = AIGateway(model)
+
+    started_at = time.perf_counter()
+    results, gaps = await _with_ticker(asyncio.gather(
+        *(AIService.analyze_resume({"summary": f"resume {index}"}, user_id=index) for index in range(calls))
+    ))
+    elapsed = time.perf_counter() - started_at
+
+    failures = _ticker_failures(f"{calls} slow calls of {delay:.2f}s", gaps, elapsed)
+    if isinstance(results, Exception):
+        failures.append(f"slow calls failed: {results!r}")
+    concurrency = min(calls, settings.ai_max_concurrent_calls)
+    expected = -(-calls // concurrency) * delay
+    if elapsed > expected * 1.5 + 0.1:
+        failures.append(f"{calls} slow calls took {elapsed:.2f}s, expected ~{expected:.2f}s; they are not overlapping")
+    return failures
+
+
+async def check_timeout(timeout: float) -> List[str]:
+    settings.ai_retry_attempts = 2
+    settings.ai_retry_base_delay_seconds = settings.ai_retry_max_delay_seconds = 0
+    model = FakeModel()
+    model.mode = "hang"
+    gateway = AIGateway(model)
+
+    started_at = time.perf_counter()
+    error, gaps = await _with_ticker(gateway.generate("prompt", user_id="check", timeout=timeout))
+    elapsed = time.perf_counter() - started_at
+
+    failures = _ticker_failures(f"hanging call with a {timeout:.2f}s timeout", gaps, elapsed)
+    if not isinstance(error, AITimeoutError):
+        failures.append(f"a call past its timeout should raise AITimeoutError, got {error!r}")
+    if model.calls != settings.ai_retry_attempts:
+        failures.append(f"expected {settings.ai_retry_attempts} timed-out attempts, saw {model.calls}")
+    if elapsed > timeout * settings.ai_retry_attempts * 1.5 + 0.1:
+        failures.append(f"the timed-out call took {elapsed:.2f}s to fail")
+    if model.in_flight:
+        failures.append(f"{model.in_flight} timed-out model calls were left running")
+    return failures
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--calls", type=int, default=8, help="Slow AI calls in flight at once")
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds each fake model call takes")
+    parser.add_argument("--timeout", type=float, default=0.2, help="Per-call timeout for the hanging call")
+    args = parser.parse_args()
+
+    failures = asyncio.run(check_slow_calls(args.calls, args.delay))
+    failures += asyncio.run(check_timeout(args.timeout))
+    finish(failures, "ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Failure-path checks for AIGateway, against a fake model.
+
+Runs scripted scenarios with no API key or network and fails unless:
+
+- a half-open probe that is cancelled frees the probe slot, so the next call
+  can probe and close the circuit (instead of failing fast forever)
+- a cancelled call in the closed state leaves the breaker untouched
+- a call rejected by the global rate limit gives its per-user token back
+
+    python -m benchmarks.ai_gateway_check
+
+Exits with status 1 on any failure.
+"""
+import asyncio
+from typing import List
+from app.core.config import settings
+from app.services.ai_gateway import AIGateway, AIRateLimitError, AIUnavailableError
+from benchmarks.common import FakeModel, finish, make_parser
+
+
+async def _cancel_after(gateway: AIGateway, seconds: float) -> None:
+    task = asyncio.ensure_future(gateway.generate("prompt"))
+    await asyncio.sleep(seconds)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+async def check_cancelled_probe() -> List[str]:
+    settings.ai_retry_attempts = 1
+    settings.ai_circuit_failure_threshold = 1
+    settings.ai_circuit_reset_seconds = 0.05
+    model = FakeModel()
+    gateway = AIGateway(model)
+
+    model.mode = "fail"
+    try:
+        await gateway.generate("prompt")
+    except Exception:
+        pass
+    if gateway.breaker.state != "open":
+        return [f"breaker should be open after a provider failure, is {gateway.breaker.state}"]
+
+    await asyncio.sleep(settings.ai_circuit_reset_seconds)
+    model.mode = "hang"
+    await _cancel_after(gateway, 0.05)
+
+    model.mode = "ok"
+    try:
+        await gateway.generate("prompt")
+    except AIUnavailableError:
+        return ["a cancelled half-open probe left the circuit failing fast"]
+    if gateway.breaker.state != "closed":
+        return [f"the probe after a cancelled one should close the circuit, breaker is {gateway.breaker.state}"]
+    return []
+
+
+async def check_cancelled_closed_call() -> List[str]:
+    settings.ai_circuit_failure_threshold = 5
+    model = FakeModel()
+    gateway = AIGateway(model)
+
+    model.mode = "hang"
+    await _cancel_after(gateway, 0.05)
+    breaker = gateway.breaker
+    if (breaker.state, breaker.consecutive_failures) != ("closed", 0):
+        return [f"a cancelled call changed the breaker: {breaker.state}, {breaker.consecutive_failures} failures"]
+    return []
+
+
+async def check_user_token_refund() -> List[str]:
+    settings.ai_rate_limit_burst = 1
+    settings.ai_rate_limit_per_second = 0.001
+    settings.ai_rate_limit_max_wait_seconds = 0
+    settings.ai_user_rate_limit_burst = 2
+    settings.ai_user_rate_limit_per_second = 0.001
+    gateway = AIGateway(FakeModel())
+
+    await gateway.generate("prompt", user_id="user")
+    try:
+        await gateway.generate("prompt", user_id="user")
+        return ["the second call should hit the global rate limit"]
+    except AIRateLimitError:
+        pass
+    tokens = gateway._user_buckets["user"].tokens
+    if tokens < 0.99:
+        return [f"the globally rejected call used up a user token ({tokens:.2f} left, expected 1)"]
+    return []
+
+
+def main() -> None:
+    make_parser(__doc__).parse_args()
+    failures: List[str] = []
+    for check in (check_cancelled_probe, check_cancelled_closed_call, check_user_token_refund):
+        problems = asyncio.run(check())
+        print(f"{'FAIL' if problems else 'ok':4}  {check.__name__}")
+        failures.extend(problems)
+    finish(failures)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Scaffolding shared by the benchmarks and checks in this directory.
+
+Each one is a module run from the repository root, so `app` is importable
+and the default paths (test.json, temp.tex) resolve:
+
+    python -m benchmarks.<name> --help
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from google.api_core import exceptions as google_exceptions
+
+
+def make_parser(doc: Optional[str]) -> argparse.ArgumentParser:
+    """Argument parser whose --help shows the module docstring, usage examples included."""
+    return argparse.ArgumentParser(description=doc, formatter_class=argparse.RawDescriptionHelpFormatter)
+
+
+def add_payload_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--payload", default="test.json", help="Resume create payload or bare content_json")
+
+
+def load_content(payload_path: str) -> Dict[str, Any]:
+    """content_json of a resume create payload, or the file itself when it is bare content_json."""
+    with open(payload_path, encoding="utf-8") as f:
+        payload = json.load(f)
+    return payload.get("content_json", payload)
+
+
+@contextmanager
+def database_url(url: Optional[str], name: str) -> Iterator[str]:
+    """url itself, or when it is None a throwaway SQLite database that is deleted afterwards."""
+    if url:
+        yield url
+        return
+    directory = tempfile.mkdtemp(prefix=f"{name}_")
+    try:
+        yield f"sqlite:///{os.path.join(directory, f'{name}.sqlite3')}"
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def iter_strings(value: Any) -> Iterator[str]:
+    """Every string inside nested dicts and lists, depth first."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_strings(item)
+
+
+def timings(fn: Callable[[], Any], runs: int, before_each: Optional[Callable[[], Any]] = None) -> List[float]:
+    """Wall time of each of runs calls to fn, in seconds; before_each runs untimed before every call."""
+    results = []
+    for _ in range(runs):
+        if before_each is not None:
+            before_each()
+        started_at = time.perf_counter()
+        fn()
+        results.append(time.perf_counter() - started_at)
+    return results
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def finish(failures: List[str], ok_message: Optional[str] = None) -> None:
+    """Print the failures and exit with status 1 if there are any."""
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    if ok_message:
+        print(ok_message)
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+        self.usage_metadata = None
+
+
+class FakeModel:
+    """
+    Stands in for genai.GenerativeModel behind AIGateway, so no API key or
+    network is needed. Each call sleeps for delay seconds, then returns
+    answer(prompt). mode switches every later call to "fail" (a retryable
+    provider error) or "hang" (never returns).
+    """
+
+    def __init__(self, delay: float = 0.0, answer: Callable[[str], str] = lambda prompt: "ok"):
+        self.delay = delay
+        self.answer = answer
+        self.mode = "ok"
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_content_async(self, prompt: str) -> FakeResponse:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.mode == "fail":
+                raise google_exceptions.ServiceUnavailable("provider down")
+            await asyncio.sleep(3600 if self.mode == "hang" else self.delay)
+            return FakeResponse(self.answer(prompt))
+        finally:
+            self.in_flight -= 1
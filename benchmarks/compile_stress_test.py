@@ -0,0 +1,135 @@
+"""
+Concurrent-compile stress test for LaTeXService._compile_local.
+
+Puts a stub `pdflatex` on PATH, so no TeX installation is needed, then runs
+N compiles of distinct documents at once and checks that:
+
+- every compile succeeded and its PDF holds its own document (no clobbering)
+- every compile used a distinct scratch directory and job name
+- no scratch directories or job files were left behind
+- wall time with N parallel compiles is close to one compile, not N of them
+
+    python -m benchmarks.compile_stress_test
+    python -m benchmarks.compile_stress_test --compiles 32 --delay 0.3 --with-format
+
+--with-format also exercises the precompiled-preamble path (the stub builds a
+fake .fmt). Exits with status 1 on any failure.
+"""
+import glob
+import hashlib
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+from app.core.config import settings
+from app.services import jake_template_1_latex_service as latex_module
+from app.services.jake_template_1_latex_service import LaTeXService
+from benchmarks.common import finish, make_parser
+
+# Copies the .tex into the PDF and logs its job name and working directory,
+# so the test can tell whose document each output holds
+_STUB_PDFLATEX = """#!{python}
+import os, sys, time
+args = sys.argv[1:]
+if "--version" in args:
+    print("pdfTeX stub")
+    sys.exit(0)
+jobname = next(arg.split("=", 1)[1] for arg in args if arg.startswith("-jobname="))
+if "-ini" in args:
+    open(jobname + ".fmt", "w").write("format")
+    sys.exit(0)
+source = open(args[-1]).read()
+time.sleep({delay})
+for ext in ("aux", "log"):
+    open(jobname + "." + ext, "w").write(jobname)
+open(jobname + ".pdf", "w").write(source)
+with open({calls_log!r}, "a") as log:
+    log.write(jobname + " " + os.getcwd() + "\\n")
+"""
+
+
+def _document(index: int) -> str:
+    return (
+        "\\documentclass{article}\n\\usepackage{hyperref}\n\\begin{document}\n"
+        f"Resume number {index}: {hashlib.sha256(str(index).encode()).hexdigest()}\n\\end{{document}}\n"
+    )
+
+
+def install_stub(directory: str, delay: float) -> str:
+    """Write the stub pdflatex into directory and return its call log path."""
+    calls_log = os.path.join(directory, "calls.log")
+    stub_path = os.path.join(directory, "pdflatex")
+    with open(stub_path, "w") as f:
+        f.write(_STUB_PDFLATEX.format(python=sys.executable, delay=delay, calls_log=calls_log))
+    os.chmod(stub_path, os.stat(stub_path).st_mode | stat.S_IEXEC)
+    open(calls_log, "w").close()
+    os.environ["PATH"] = directory + os.pathsep + os.environ["PATH"]
+    return calls_log
+
+
+def run_compiles(output_dir: str, count: int, workers: int) -> Tuple[float, List[Tuple[bool, str]]]:
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(
+            lambda index: LaTeXService._compile_local(_document(index), os.path.join(output_dir, f"{index}.pdf"), timeout=30),
+            range(count)
+        ))
+    return time.perf_counter() - started_at, results
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--compiles", type=int, default=16)
+    parser.add_argument("--delay", type=float, default=0.2, help="Seconds each stub compile takes")
+    parser.add_argument("--with-format", action="store_true", help="Also go through the precompiled-preamble path")
+    args = parser.parse_args()
+
+    work_root = tempfile.mkdtemp(prefix="compile_stress_")
+    failures: List[str] = []
+    try:
+        calls_log = install_stub(work_root, args.delay)
+        output_dir = os.path.join(work_root, "out")
+        os.makedirs(output_dir)
+        settings.latex_precompile_preamble = args.with_format
+        latex_module._preamble_formats = latex_module._PreambleFormatCache(os.path.join(work_root, "formats"))
+        scratch_before = set(glob.glob(os.path.join(tempfile.gettempdir(), "latex_*")))
+        cwd_before = set(os.listdir("."))
+
+        serial_seconds, _ = run_compiles(output_dir, 2, 1)
+        parallel_seconds, results = run_compiles(output_dir, args.compiles, args.compiles)
+
+        for index, (success, message) in enumerate(results):
+            path = os.path.join(output_dir, f"{index}.pdf")
+            if not success:
+                failures.append(f"compile {index} failed: {message}")
+            elif open(path).read() != _document(index):
+                failures.append(f"compile {index} produced another document's PDF")
+
+        calls = [line.split(" ", 1) for line in open(calls_log).read().splitlines()]
+        parallel_calls = calls[-args.compiles:]
+        if len({jobname for jobname, _ in parallel_calls}) != args.compiles:
+            failures.append("job names were reused across concurrent compiles")
+        if len({cwd for _, cwd in parallel_calls}) != args.compiles:
+            failures.append("scratch directories were shared across concurrent compiles")
+
+        leftovers = set(glob.glob(os.path.join(tempfile.gettempdir(), "latex_*"))) - scratch_before
+        if leftovers:
+            failures.append(f"scratch directories left behind: {sorted(leftovers)}")
+        if set(os.listdir(".")) - cwd_before:
+            failures.append(f"files written to the working directory: {sorted(set(os.listdir('.')) - cwd_before)}")
+
+        per_compile = serial_seconds / 2
+        print(f"{args.compiles} parallel compiles: {parallel_seconds:.2f}s (one compile: {per_compile:.2f}s, "
+              f"serial would take ~{per_compile * args.compiles:.2f}s)")
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+
+    finish(failures, "ok: outputs isolated, job names unique, nothing left behind")
+
+
+if __name__ == "__main__":
+    main()
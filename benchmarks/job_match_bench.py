@@ -0,0 +1,128 @@
+"""
+JobMatchIndex vs brute-force ranking benchmark.
+
+Builds synthetic job postings, scores a few resume variants (test.json with
+shuffled skills) against all of them with:
+
+- brute force: one TF-IDF dict per job and a Python dot product for every pair
+- JobMatchIndex: one sparse matrix, scored with vectorized NumPy operations
+
+It fails when the two disagree on any score or on the ranking, then prints
+the build and scoring time of each. No database is needed:
+
+    python -m benchmarks.job_match_bench
+    python -m benchmarks.job_match_bench --jobs 5000 --words 400 --resumes 10
+
+Exits with status 1 when the scores or rankings differ.
+"""
+import copy
+import math
+import random
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, List, Sequence
+import numpy as np
+from app.modules.analysis.services.analysis_service import AnalysisService, JobMatchIndex
+from app.services.prompt_context import build_resume_context
+from benchmarks.common import add_payload_argument, finish, load_content, make_parser
+
+SKILLS = (
+    "python java react node.js postgres docker kubernetes aws gcp sql pandas numpy machine learning tensorflow "
+    "rest api microservices golang typescript js ci/cd git linux spark kafka redis graphql testing agile scrum"
+).split()
+FILLER = (
+    "we are seeking an engineer who will build maintain and improve our platform collaborate with product "
+    "stakeholders and deliver features leadership communication design scalable distributed systems"
+).split()
+TITLES = ["Backend Engineer", "Data Scientist", "Frontend Developer", "Site Reliability Engineer"]
+
+
+def synthetic_jobs(count: int, words: int, rng: random.Random) -> List[Any]:
+    vocabulary = SKILLS + FILLER * 2
+    return [
+        SimpleNamespace(id=index, title=rng.choice(TITLES), description=" ".join(rng.choices(vocabulary, k=words)))
+        for index in range(count)
+    ]
+
+
+class BruteForceIndex:
+    """The same TF-IDF cosine as JobMatchIndex, over one plain dict of term weights per job."""
+
+    def __init__(self, jobs: Sequence[Any]):
+        job_counts = [Counter(AnalysisService.tokenize(f"{job.title}\n{job.description}")) for job in jobs]
+        document_frequency: Counter = Counter()
+        for counts in job_counts:
+            document_frequency.update(counts.keys())
+        self.idf = {term: math.log((1 + len(jobs)) / (1 + df)) + 1 for term, df in document_frequency.items()}
+        self.job_weights = [
+            {term: (1 + math.log(count)) * self.idf[term] for term, count in counts.items()} for counts in job_counts
+        ]
+        self.norms = [math.sqrt(sum(weight * weight for weight in weights.values())) for weights in self.job_weights]
+
+    def scores(self, resume_content: Dict[str, Any]) -> List[float]:
+        resume_counts = Counter(AnalysisService.tokenize(build_resume_context(resume_content).text))
+        resume = {term: (1 + math.log(count)) * self.idf[term] for term, count in resume_counts.items() if term in self.idf}
+        resume_norm = math.sqrt(sum(weight * weight for weight in resume.values()))
+        scores = []
+        for weights, norm in zip(self.job_weights, self.norms):
+            dot = sum(weight * resume.get(term, 0.0) for term, weight in weights.items())
+            scores.append(dot / (norm * resume_norm) if norm and resume_norm else 0.0)
+        return scores
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    add_payload_argument(parser)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=300, help="Words per job description")
+    parser.add_argument("--resumes", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base = load_content(args.payload)
+    jobs = synthetic_jobs(args.jobs, args.words, rng)
+    resumes = []
+    for _ in range(args.resumes):
+        resume = copy.deepcopy(base)
+        resume["skills"] = {"categories": [{"name": "Skills", "items": rng.sample(SKILLS, 10)}]}
+        resumes.append(resume)
+
+    started_at = time.perf_counter()
+    brute_force = BruteForceIndex(jobs)
+    brute_build_seconds = time.perf_counter() - started_at
+    started_at = time.perf_counter()
+    expected = [brute_force.scores(resume) for resume in resumes]
+    brute_score_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    index = JobMatchIndex(jobs)
+    build_seconds = time.perf_counter() - started_at
+    started_at = time.perf_counter()
+    actual = [index.scores(index.resume_vector(resume)) for resume in resumes]
+    score_seconds = time.perf_counter() - started_at
+
+    failures = []
+    for position, (want, got) in enumerate(zip(expected, actual)):
+        want = np.asarray(want)
+        if not np.allclose(want, got, rtol=0, atol=1e-9):
+            failures.append(f"resume {position}: scores differ by up to {np.max(np.abs(want - got)):.2e}")
+        # Rounded, so float noise cannot reorder tied jobs
+        elif not np.array_equal(np.argsort(-want.round(9), kind="stable")[:20], np.argsort(-got.round(9), kind="stable")[:20]):
+            failures.append(f"resume {position}: top-20 ranking differs")
+
+    pairs = args.jobs * args.resumes
+    print(f"{args.resumes} resumes x {args.jobs} jobs ({args.words} words each) = {pairs} pairs")
+    for name, build, score in [
+        ("brute force", brute_build_seconds, brute_score_seconds),
+        ("JobMatchIndex", build_seconds, score_seconds),
+    ]:
+        print(f"{name:14} build {build * 1000:8.1f} ms   scoring {score * 1000:8.1f} ms = {score / pairs * 1e6:6.2f} us/pair")
+    print(f"scoring speedup: {brute_score_seconds / score_seconds:.1f}x")
+
+    finish(failures)
+
+
+if __name__ == "__main__":
+    main()
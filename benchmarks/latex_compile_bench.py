@@ -0,0 +1,78 @@
+"""
+Cold vs warm compile benchmark for LaTeXService._compile_local.
+
+Renders a resume (test.json into temp.tex by default), then compiles it
+repeatedly with a real pdflatex:
+
+- cold: a full compile that parses every package in the preamble
+- warm: a compile that loads the template's precompiled preamble format
+
+It prints the one-off format build time, the median of each mode and the
+speedup. Requires TeX Live with mylatexformat (texlive-latex-extra):
+
+    python -m benchmarks.latex_compile_bench
+    python -m benchmarks.latex_compile_bench --runs 20 --template temp.tex --payload test.json
+
+Exits with status 1 when pdflatex is missing or a compile fails.
+"""
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import List
+from app.core.config import settings
+from app.services import jake_template_1_latex_service as latex_module
+from app.services.jake_template_1_latex_service import LaTeXService
+from benchmarks.common import add_payload_argument, finish, load_content, make_parser, timings
+
+
+def time_compiles(latex_content: str, output_dir: str, runs: int, warm: bool) -> List[float]:
+    """Wall time of each compile, in seconds."""
+    settings.latex_precompile_preamble = warm
+    output_path = os.path.join(output_dir, "out.pdf")
+
+    def compile_once() -> None:
+        success, message = LaTeXService._compile_local(latex_content, output_path)
+        if not success:
+            finish([f"{'warm' if warm else 'cold'} compile: {message}"])
+
+    return timings(compile_once, runs)
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--template", default="temp.tex")
+    add_payload_argument(parser)
+    parser.add_argument("--runs", type=int, default=10, help="Compiles per mode")
+    args = parser.parse_args()
+
+    if not LaTeXService._is_pdflatex_available():
+        finish(["pdflatex is not installed; install TeX Live to run this benchmark"])
+
+    with open(args.template, encoding="utf-8") as f:
+        template = f.read()
+    latex_content = LaTeXService.render_template(template, load_content(args.payload), template_id=1)
+
+    work_root = tempfile.mkdtemp(prefix="latex_bench_")
+    try:
+        # A private format directory, so the first warm compile really builds the format
+        latex_module._preamble_formats = latex_module._PreambleFormatCache(os.path.join(work_root, "formats"))
+        started_at = time.perf_counter()
+        if not latex_module._preamble_formats.get(latex_content):
+            finish(["could not build the preamble format (is mylatexformat installed?)"])
+        build_seconds = time.perf_counter() - started_at
+
+        cold = statistics.median(time_compiles(latex_content, work_root, args.runs, warm=False))
+        warm = statistics.median(time_compiles(latex_content, work_root, args.runs, warm=True))
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+
+    print(f"format build (once per template): {build_seconds * 1000:7.0f} ms")
+    print(f"cold compile (median of {args.runs}):     {cold * 1000:7.0f} ms")
+    print(f"warm compile (median of {args.runs}):     {warm * 1000:7.0f} ms")
+    print(f"speedup: {cold / warm:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark and golden check for LaTeXService._escape_latex.
+
+Compares the single-pass escaper against the original chained str.replace
+implementation on every string of a content_json payload (test.json by
+default) plus edge cases, fails if any output differs, then times both:
+
+    python -m benchmarks.latex_escape_bench
+    python -m benchmarks.latex_escape_bench --payload my_resume.json --repeat 2000
+"""
+import timeit
+from typing import List
+from app.services.jake_template_1_latex_service import LaTeXService
+from benchmarks.common import add_payload_argument, finish, iter_strings, load_content, make_parser
+
+# Inputs the resume payload may not cover: every special character, commands, backslashes
+EDGE_CASES = [
+    "", "plain text", "R&D", "100%", "$5M", "C#", "snake_case", "{braces}", "~home", "x^2",
+    "back\\slash", "\\textbf{bold} & more", "\\href{https://a.b/c_d}{link}", "\\emph{x}_y",
+    "\\textit{a}%b", "\\section{not a known command}", "\\\\", "&%$#_{}~^\\", "unicode: café – ✓",
+    "mixed \\textbf{A&B} 50% of $1 #1 a_b {c} ~d ^e",
+]
+
+
+def reference_escape(text: str) -> str:
+    """The original implementation, kept verbatim as the golden reference."""
+    if not text:
+        return ""
+
+    result = str(text)
+
+    if not ('\\' in result and any(cmd in result for cmd in ['\\textbf', '\\href', '\\emph', '\\textit'])):
+        result = result.replace('\\', r'\textbackslash{}')
+
+    result = result.replace('&', r'\&')
+    result = result.replace('%', r'\%')
+    result = result.replace('$', r'\$')
+    result = result.replace('#', r'\#')
+    result = result.replace('_', r'\_')
+    result = result.replace('{', r'\{')
+    result = result.replace('}', r'\}')
+    result = result.replace('~', r'\textasciitilde{}')
+    result = result.replace('^', r'\^{}')
+
+    return result
+
+
+def load_corpus(payload_path: str) -> List[str]:
+    return list(iter_strings(load_content(payload_path)))
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    add_payload_argument(parser)
+    parser.add_argument("--repeat", type=int, default=1000, help="Passes over the corpus per timing")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.payload)
+    mismatches = [
+        f"{text!r}: {LaTeXService._escape_latex(text)!r} != {reference_escape(text)!r}"
+        for text in corpus + EDGE_CASES
+        if LaTeXService._escape_latex(text) != reference_escape(text)
+    ]
+
+    timings = {}
+    for name, escape in [("chained str.replace", reference_escape), ("single-pass regex", LaTeXService._escape_latex)]:
+        seconds = min(timeit.repeat(lambda: [escape(text) for text in corpus], number=args.repeat, repeat=3))
+        timings[name] = seconds
+        print(f"{name:20} {seconds / (args.repeat * len(corpus)) * 1e9:8.0f} ns/string  ({len(corpus)} strings x {args.repeat})")
+    print(f"speedup: {timings['chained str.replace'] / timings['single-pass regex']:.2f}x")
+    finish(mismatches)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Login latency under concurrency: threadpool bcrypt vs the password hasher.
+
+Fires N logins at once, each verifying a bcrypt hash (settings.bcrypt_rounds).
+While they run, a cheap sync endpoint is called repeatedly on the same
+threadpool FastAPI uses. Two setups are compared:
+
+- threadpool bcrypt: verify_password in anyio's threadpool, as before
+- process pool + limiter: the /token route now (login slots + password_hasher)
+
+It prints login throughput, login latency p50/p99, how many logins got a 429
+(logins still queued after settings.auth_login_wait_seconds), and the other
+endpoint's latency:
+
+    python -m benchmarks.password_hash_bench
+    python -m benchmarks.password_hash_bench --logins 100 --probes 40
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+import anyio
+from app.core.config import settings
+from app.core.password_hasher import PasswordHasherBusy, password_hasher
+from app.core.security import get_password_hash, verify_password
+from benchmarks.common import make_parser, percentile
+
+PASSWORD = "correct horse battery staple"
+
+
+async def run(login: Callable[[], Awaitable[Any]], logins: int, probes: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    rejected = 0
+
+    async def timed_login() -> None:
+        nonlocal rejected
+        started_at = time.perf_counter()
+        if await login() is True:
+            latencies.append(time.perf_counter() - started_at)
+        else:
+            rejected += 1
+
+    started_at = time.perf_counter()
+    tasks = [asyncio.create_task(timed_login()) for _ in range(logins)]
+    await asyncio.sleep(0.05)
+    probe_latencies = []
+    for _ in range(probes):
+        probe_started_at = time.perf_counter()
+        await anyio.to_thread.run_sync(lambda: sum(range(1000)))
+        probe_latencies.append(time.perf_counter() - probe_started_at)
+        await asyncio.sleep(0.01)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started_at
+
+    return {
+        "seconds": elapsed,
+        "ok_per_second": len(latencies) / elapsed,
+        "rejected": rejected,
+        "login_p50_ms": percentile(latencies, 0.5) * 1000,
+        "login_p99_ms": percentile(latencies, 0.99) * 1000,
+        "other_p50_ms": percentile(probe_latencies, 0.5) * 1000,
+        "other_max_ms": max(probe_latencies) * 1000,
+    }
+
+
+async def main_async(logins: int, probes: int) -> None:
+    hashed = get_password_hash(PASSWORD)
+    login_slots = asyncio.Semaphore(settings.password_hash_max_workers)
+
+    async def threadpool_login() -> bool:
+        return await anyio.to_thread.run_sync(verify_password, PASSWORD, hashed)
+
+    async def pooled_login() -> Any:
+        # Mirrors the /token route: wait for a login slot, then verify in the process pool
+        try:
+            await asyncio.wait_for(login_slots.acquire(), settings.auth_login_wait_seconds)
+        except asyncio.TimeoutError:
+            return "429"
+        try:
+            return await password_hasher.verify(PASSWORD, hashed)
+        except PasswordHasherBusy:
+            return "429"
+        finally:
+            login_slots.release()
+
+    # Spawn the hashing workers before timing anything
+    await password_hasher.verify(PASSWORD, hashed)
+
+    print(f"{logins} concurrent logins, bcrypt cost {settings.bcrypt_rounds}, "
+          f"{settings.password_hash_max_workers} hashing processes and login slots, "
+          f"{settings.auth_login_wait_seconds:g} s max wait for a slot")
+    for name, login in [("threadpool bcrypt", threadpool_login), ("process pool + limiter", pooled_login)]:
+        result = await run(login, logins, probes)
+        print(
+            f"{name:23} {result['seconds']:6.2f} s  {result['ok_per_second']:5.1f} ok/s  "
+            f"{result['rejected']:3} x 429 ({result['rejected'] / logins:4.0%})  "
+            f"login p50 {result['login_p50_ms']:6.0f} ms p99 {result['login_p99_ms']:6.0f} ms  "
+            f"other endpoint p50 {result['other_p50_ms']:5.1f} ms max {result['other_max_ms']:6.1f} ms"
+        )
+    print(f"password hasher: {password_hasher.stats()}")
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--logins", type=int, default=40, help="Concurrent logins")
+    parser.add_argument("--probes", type=int, default=20, help="Calls to the other endpoint during the burst")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args.logins, args.probes))
+
+
+# Hashing workers are spawned and re-import this module, so only run under __main__
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Prompt-size benchmark for the compact resume context sent to the LLM.
+
+For the resume in test.json, and for synthetic resumes with more experience
+bullets, prints the estimated tokens of the raw content_json form that used
+to go into prompts, of the compact text, and of the compact text trimmed to
+settings.ai_prompt_token_budget. It also reports the tokens saved per prep
+kit (one prompt per section) and the time to build the context.
+
+    python -m benchmarks.prompt_size_bench
+    python -m benchmarks.prompt_size_bench --payload my_resume.json --bullets 50 500
+
+Exits with status 1 when the untrimmed compact text of the --payload resume
+is missing a company, role, school, project, certification or skill
+from the original.
+"""
+import time
+from typing import Any, Dict, Iterator, List
+from app.core.config import settings
+from app.services.ai_service import PREP_KIT_SECTIONS
+from app.services.prompt_context import build_resume_context
+from benchmarks.common import add_payload_argument, finish, iter_strings, load_content, make_parser
+from benchmarks.latex_render_bench import synthetic_resume
+
+# (section, key) pairs whose values must survive compaction
+_FACT_KEYS = [
+    ("experience", "company"), ("experience", "position"), ("education", "institution"),
+    ("projects", "name"), ("certifications", "name"), ("leadership", "organization"),
+]
+
+
+def _facts(content: Dict[str, Any]) -> Iterator[str]:
+    for section, key in _FACT_KEYS:
+        for entry in content.get(section) or []:
+            if isinstance(entry, dict) and entry.get(key):
+                yield str(entry[key])
+    yield from (skill for skill in iter_strings(content.get("skills")) if skill)
+
+
+def measure(label: str, content: Dict[str, Any], budget: int) -> str:
+    started_at = time.perf_counter()
+    compact = build_resume_context(content)
+    build_ms = (time.perf_counter() - started_at) * 1000
+    trimmed = build_resume_context(content, budget)
+    saved_per_kit = (compact.tokens_before - trimmed.tokens_after) * len(PREP_KIT_SECTIONS)
+    return (
+        f"{label:>16}: raw {compact.tokens_before:6} -> compact {compact.tokens_after:6} "
+        f"({1 - compact.tokens_after / compact.tokens_before:4.0%} smaller) -> budgeted {trimmed.tokens_after:5} tokens; "
+        f"{saved_per_kit:7} saved per prep kit; built in {build_ms:.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    add_payload_argument(parser)
+    parser.add_argument("--bullets", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--budget", type=int, default=settings.ai_prompt_token_budget)
+    args = parser.parse_args()
+
+    base = load_content(args.payload)
+
+    rows: List[str] = [measure(args.payload, base, args.budget)]
+    for bullets in args.bullets:
+        rows.append(measure(f"{bullets} bullets", synthetic_resume(base, bullets), args.budget))
+    print("\n".join(rows))
+
+    text = build_resume_context(base).text
+    finish([f"compact text is missing {fact!r}" for fact in _facts(base) if fact not in text])
+
+
+if __name__ == "__main__":
+    main()